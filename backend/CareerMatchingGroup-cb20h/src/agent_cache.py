@@ -0,0 +1,81 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# ===============================================================
+# 🗃️ Sub-agent response cache (per-agent TTL, size-bounded LRU)
+# ===============================================================
+# Keyed by (agent key, caller, normalized prompt). Each caller has their own
+# sub-agent session with carry-over context (agent_sessions.py), so a reply is
+# only reused for a repeat of the prompt by the same caller; a hit makes no
+# Bedrock call and so leaves that session's turn/token accounting unchanged.
+# Course catalogs change slowly, job listings quickly; resume feedback depends
+# on the student's own resume in the sub-agent session, so it isn't cached.
+# Override with ROUTER_CACHE_TTL_<AGENT>.
+
+DEFAULT_TTLS = {
+    "job": 600,
+    "course": 24 * 3600,
+    "project": 6 * 3600,
+    "resume": 0,
+}
+CACHE_MAX_ENTRIES = int(os.getenv("ROUTER_CACHE_MAX_ENTRIES", "256"))
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(_NON_WORD_RE.sub(" ", (prompt or "").lower()).split())
+
+
+def ttl_for(agent_key: str) -> int:
+    override = os.getenv(f"ROUTER_CACHE_TTL_{agent_key.upper()}")
+    return int(override) if override else DEFAULT_TTLS.get(agent_key, 0)
+
+
+class AgentResponseCache:
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttls: Optional[Dict[str, int]] = None):
+        self.max_entries = max_entries
+        self.ttls = ttls or {key: ttl_for(key) for key in DEFAULT_TTLS}
+        # (agent, caller, prompt) -> (reply, expires_at)
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, agent_key: str, what: str) -> None:
+        stats = self.metrics.setdefault(agent_key, {"hits": 0, "misses": 0, "evictions": 0})
+        stats[what] += 1
+
+    def get(self, agent_key: str, prompt: str, caller: str = "anonymous") -> Optional[str]:
+        if self.ttls.get(agent_key, 0) <= 0:
+            return None
+        key = (agent_key, caller, normalize_prompt(prompt))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self._count(agent_key, "hits")
+                hit = entry[0]
+            else:
+                if entry:
+                    del self._entries[key]
+                self._count(agent_key, "misses")
+                hit = None
+            stats = dict(self.metrics[agent_key])
+        print(f"🗃️ Sub-agent cache {'hit' if hit is not None else 'miss'} [{agent_key}] {stats}")
+        return hit
+
+    def put(self, agent_key: str, prompt: str, reply: str, caller: str = "anonymous") -> None:
+        ttl = self.ttls.get(agent_key, 0)
+        if ttl <= 0 or not reply:
+            return
+        key = (agent_key, caller, normalize_prompt(prompt))
+        with self._lock:
+            self._entries[key] = (reply, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                (evicted_agent, _, _), _ = self._entries.popitem(last=False)
+                self._count(evicted_agent, "evictions")
@@ -0,0 +1,108 @@
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+# ===============================================================
+# 🧵 Per-user sub-agent sessions with rotation
+# ===============================================================
+# Each caller (user + conversation) gets its own session on each sub-agent
+# instead of one shared "session-<agent>". A session is rotated after
+# ROUTER_SESSION_MAX_TURNS turns or ~ROUTER_SESSION_MAX_TOKENS tokens; the new
+# session starts with a short carry-over of the last exchange (compaction), so
+# sub-agent context and latency stay bounded. Generations are random ids, so a
+# cold start simply opens fresh sessions rather than reusing a large one.
+
+MAX_TURNS = int(os.getenv("ROUTER_SESSION_MAX_TURNS", "12"))
+MAX_TOKENS = int(os.getenv("ROUTER_SESSION_MAX_TOKENS", "24000"))
+IDLE_TTL = int(os.getenv("ROUTER_SESSION_IDLE_TTL", "1800"))
+CARRYOVER_CHARS = 600
+CHARS_PER_TOKEN = 4  # rough estimate; good enough for a rotation budget
+
+_SAFE_RE = re.compile(r"[^0-9a-zA-Z._:-]")
+
+
+def caller_key(event: dict) -> str:
+    """User + conversation of whoever called the router ("anonymous" when unknown)."""
+    attrs = event.get("sessionAttributes") or {}
+    session = str(event.get("sessionId") or "anonymous")
+    user = str(attrs.get("userId") or "")
+    if user and not session.startswith(user):
+        session = f"{user}.{session}"
+    return _SAFE_RE.sub("-", session)[:64]
+
+
+def _estimate_tokens(*texts: str) -> int:
+    return sum(len(t or "") for t in texts) // CHARS_PER_TOKEN
+
+
+class SubAgentSessionManager:
+    def __init__(self, max_turns: int = MAX_TURNS, max_tokens: int = MAX_TOKENS, idle_ttl: int = IDLE_TTL,
+                 max_sessions: int = 1000):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rotations = 0
+
+    def _new_record(self, carryover: str = "") -> Dict:
+        return {"generation": uuid.uuid4().hex[:8], "turns": 0, "tokens": 0, "carryover": carryover,
+                "updated_at": time.time()}
+
+    def begin_turn(self, agent_key: str, caller: str, prompt: str) -> Tuple[str, str]:
+        """(Bedrock sessionId, prompt) for this turn; the prompt gains the carry-over on a fresh session."""
+        with self._lock:
+            key = (agent_key, caller)
+            record = self._sessions.get(key)
+            if record is None or time.time() - record["updated_at"] > self.idle_ttl:
+                record = self._new_record()
+                self._sessions[key] = record
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+            if record["turns"] == 0 and record["carryover"]:
+                prompt = f"Context from earlier in this conversation: {record['carryover']}\n\n{prompt}"
+            session_id = f"{caller}.{agent_key}.{record['generation']}"
+        return session_id[:100], prompt
+
+    def end_turn(self, agent_key: str, caller: str, prompt: str, reply: str) -> Dict:
+        """Counts the turn; rotates the session once it passes the turn/token budget. Returns its stats."""
+        with self._lock:
+            record = self._sessions.get((agent_key, caller))
+            if record is None:
+                return {}
+            record["turns"] += 1
+            record["tokens"] += _estimate_tokens(prompt, reply)
+            record["updated_at"] = time.time()
+            stats = {"turns": record["turns"], "tokens": record["tokens"], "generation": record["generation"]}
+
+            if record["turns"] >= self.max_turns or record["tokens"] >= self.max_tokens:
+                exchange = f"Asked: {prompt[:200]} Answered: {reply}"
+                carryover = exchange[:CARRYOVER_CHARS].rsplit(" ", 1)[0] + ("…" if len(exchange) > CARRYOVER_CHARS else "")
+                self._sessions[(agent_key, caller)] = self._new_record(carryover)
+                self.rotations += 1
+                stats["rotated"] = True
+                print(f"🔄 Rotated {agent_key} session for {caller} after {record['turns']} turn(s), "
+                      f"~{record['tokens']} tokens")
+            return stats
+
+    def snapshot(self) -> Dict:
+        """Session-size metrics across this container's live sessions."""
+        with self._lock:
+            records = list(self._sessions.items())
+        per_agent: Dict[str, Dict] = {}
+        for (agent_key, _), record in records:
+            stats = per_agent.setdefault(agent_key, {"sessions": 0, "max_turns": 0, "max_tokens": 0, "total_tokens": 0})
+            stats["sessions"] += 1
+            stats["max_turns"] = max(stats["max_turns"], record["turns"])
+            stats["max_tokens"] = max(stats["max_tokens"], record["tokens"])
+            stats["total_tokens"] += record["tokens"]
+        for stats in per_agent.values():
+            stats["avg_tokens"] = stats.pop("total_tokens") // max(stats["sessions"], 1)
+        return {"sessions": len(records), "rotations": self.rotations, "agents": per_agent}
@@ -0,0 +1,124 @@
+import json
+import os
+import re
+from typing import Optional, Tuple
+
+from aws_clients import lazy_client
+
+# ===============================================================
+# 🛠️ Direct tool execution (skips the nested sub-agent hop)
+# ===============================================================
+# For intents backed by a deterministic tool, the router invokes the tool's
+# Lambda itself (serpapi job search, course catalog) and returns its result as
+# reply text, instead of asking a sub-agent that would make the same tool call
+# after its own LLM round trip. ROUTER_DIRECT_TOOLS lists the intents to
+# handle this way ("" disables); any failure falls back to the sub-agent.
+# "course" is opt-in: the course catalog Lambda still returns a simulated list.
+
+DIRECT_TOOL_INTENTS = {i.strip() for i in os.getenv("ROUTER_DIRECT_TOOLS", "job").split(",") if i.strip()}
+TOOL_FUNCTIONS = {
+    "job": os.getenv("SERPAPI_LAMBDA_NAME") or "serpapi-google-jobs",
+    "course": os.getenv("COURSE_CATALOG_LAMBDA_NAME") or "CourseCatalogGroup-3yf4a",
+}
+
+# The serpapi Lambda may take up to its 30s timeout; a retried search would be a duplicate
+lambda_client = lazy_client("lambda", retries={"mode": "standard", "total_max_attempts": 1})
+
+_LOCATION_RE = re.compile(r"\b(?:in|near|around)\s+([A-Za-z][A-Za-z .'-]*(?:,\s*[A-Za-z .]+)?)\s*[?.!]*$")
+_FILLER_RE = re.compile(
+    r"^(?:please\s+)?(?:(?:find|show|get|search for|look for|list)(?:\s+me)?\s+)?(?:some\s+|any\s+|current\s+)?",
+    re.IGNORECASE,
+)
+
+
+_COURSE_TOPIC_RE = re.compile(
+    r"\b(?:for|about|on|in|covering|related to|to learn|to study)\s+(?:(?:a|an|the|some)\s+)?(.+?)(?:\s+at utd)?[?.!]*$",
+    re.IGNORECASE,
+)
+_COURSE_FILLER_RE = re.compile(
+    r"\b(?:what|which|should|could|would|can|do|does|i|you|take|suggest|recommend|find|show|me|are|is|good|"
+    r"best|any|some|the|a|an|utd|courses?|class(?:es)?|electives?)\b",
+    re.IGNORECASE,
+)
+
+
+def extract_course_topic(text: str) -> str:
+    """"which courses should I take for machine learning?" -> "machine learning"."""
+    text = " ".join((text or "").split())
+    match = _COURSE_TOPIC_RE.search(text)
+    topic = match.group(1) if match else _COURSE_FILLER_RE.sub(" ", text)
+    return " ".join(topic.split()).strip(" ?.!,") or text
+
+
+def split_query_location(text: str) -> Tuple[str, Optional[str]]:
+    """"software engineering internships in Dallas, TX" -> ("software engineering internships", "Dallas, TX")."""
+    text = " ".join((text or "").split())
+    location = None
+    match = _LOCATION_RE.search(text)
+    if match:
+        location = match.group(1).strip()
+        text = text[:match.start()]
+    return _FILLER_RE.sub("", text).strip(" ?.!,") or text.strip(), location
+
+
+def _invoke(function_name: str, payload: dict) -> dict:
+    response = lambda_client.invoke(FunctionName=function_name, InvocationType="RequestResponse",
+                                    Payload=json.dumps(payload).encode("utf-8"))
+    if response.get("FunctionError"):
+        raise RuntimeError(f"{function_name} failed: {response['Payload'].read()[:300]!r}")
+    return json.loads(response["Payload"].read().decode("utf-8"))
+
+
+def format_jobs(data: dict) -> str:
+    """The serpapi result as the reply text the job agent would give: one numbered entry per job."""
+    where = f" in {data['location']}" if data.get("location") else ""
+    lines = [f"Here are current openings for {data.get('query')}{where}:", ""]
+    for n, job in enumerate(data.get("jobs") or [], 1):
+        company = f" at {job['company']}" if job.get("company") else ""
+        details = ", ".join(v for v in (job.get("location"), job.get("posted_at")) if v)
+        lines.append(f"{n}. **{job.get('title') or 'Untitled role'}**{company}" + (f" ({details})" if details else ""))
+        if job.get("link"):
+            lines.append(f"   Apply: {job['link']}")
+    return "\n".join(lines)
+
+
+def _search_jobs(user_input: str, session_id: str) -> Optional[str]:
+    query, location = split_query_location(user_input)
+    payload = {"query": query, "sessionId": session_id}
+    if location:
+        payload["location"] = location
+    result = _invoke(TOOL_FUNCTIONS["job"], payload).get("response", {})
+    if result.get("httpStatusCode") != 200:
+        print(f"⚠️ Direct job search returned {result.get('httpStatusCode')}; falling back to the job agent")
+        return None
+    data = json.loads(result["responseBody"]["application/json"]["body"])
+    if not data.get("count"):
+        return None  # let the agent broaden the search
+    return format_jobs(data)
+
+
+def _find_courses(user_input: str, session_id: str) -> Optional[str]:
+    topic = extract_course_topic(user_input)
+    result = _invoke(TOOL_FUNCTIONS["course"], {"parameters": {"topic": topic}, "sessionId": session_id})
+    body = result.get("response", {}).get("functionResponse", {}).get("responseBody", {}).get("TEXT", {}).get("body")
+    if not body or body.startswith("Error:"):
+        return None
+    return body
+
+
+_TOOLS = {"job": _search_jobs, "course": _find_courses}
+
+
+def run_direct_tool(intent: str, user_input: str, session_id: str = "") -> Optional[str]:
+    """The tool's answer for this intent as reply text, or None to use the sub-agent instead."""
+    tool = _TOOLS.get(intent)
+    if tool is None or intent not in DIRECT_TOOL_INTENTS:
+        return None
+    try:
+        output = tool(user_input, session_id)
+    except Exception as e:
+        print(f"⚠️ Direct {intent} tool failed ({e}); falling back to the {intent} agent")
+        return None
+    if output is not None:
+        print(f"🛠️ Answered {intent} directly from {TOOL_FUNCTIONS[intent]} ({len(output)} chars)")
+    return output
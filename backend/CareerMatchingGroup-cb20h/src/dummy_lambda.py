@@ -1,14 +1,23 @@
 import json
-import boto3
-from botocore.config import Config
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from aws_clients import lazy_client
+from completion_reader import CompletionReader
+from intent_classifier import classify_intent
+from intent_model import load_default_model
+from agent_cache import AgentResponseCache
+from direct_tools import DIRECT_TOOL_INTENTS, lambda_client, run_direct_tool
+from agent_sessions import SubAgentSessionManager, caller_key
+from priming import Primer, warm_aws_connection, warm_bedrock_agent_runtime
 
 # ===============================================================
 # ⚙️ Global client + configuration
 # ===============================================================
-bedrock = boto3.client(
-    "bedrock-agent-runtime",
-    config=Config(read_timeout=60, connect_timeout=10, retries={"max_attempts": 2}),
-)
+# Created on first use; the pool covers concurrent fan-out calls (aws_clients.MAX_POOL_CONNECTIONS)
+# A retried invoke_agent re-runs the sub-agent and would outlast the fan-out deadline
+bedrock = lazy_client("bedrock-agent-runtime", read_timeout=60,
+                      retries={"mode": "standard", "total_max_attempts": 1})
 
 AGENTS = {
     "job":     ("NZI8TPUR3R", "GEXWIDRZ1M"),
@@ -17,60 +26,173 @@ AGENTS = {
     "resume":  ("LQLAP4LIDX", "2Y678X9SU8"),
 }
 
+# Action group responses are capped (~25 KB), so stop reading sub-agent output here
+MAX_AGENT_OUTPUT_CHARS = 20000
+
+# Identical (agent, prompt) pairs within an agent's TTL skip the sub-agent run
+agent_cache = AgentResponseCache()
+
+# One sub-agent session per caller, rotated once it grows past a turn/token budget
+session_manager = SubAgentSessionManager()
+
 # ===============================================================
-# 🧠 Smarter intent detection
+# 🧠 Intent routing: trained model → keyword matcher → orchestrator
 # ===============================================================
-def detect_intent(user_input: str) -> str:
-    text = user_input.lower()
+# Offline-trained Naive Bayes model (intent_model.bin); keyword matcher alone when absent
+intent_model = load_default_model()
+MODEL_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_MODEL_THRESHOLD", "0.7"))
+KEYWORD_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_KEYWORD_THRESHOLD", "0.6"))
+# When neither is confident, hand the choice back to the orchestrator
+# (needs an optional `intent` parameter on generate_plan). Its decisions are the
+# only ROUTING log lines `intent_model.py train --logs` learns from by default.
+ASK_ORCHESTRATOR_ON_LOW_CONFIDENCE = os.getenv("ROUTER_ASK_ORCHESTRATOR", "0") == "1"
 
-    # Resume intent
-    if any(k in text for k in ["resume", "cv", "linkedin", "cover letter", "improve my resume"]):
-        return "resume"
 
-    # Project intent
-    if any(k in text for k in [
-        "project", "portfolio", "build", "create", "make", "ideas", "coding", "develop"
-    ]):
-        return "project"
+def route_intent(user_input: str):
+    """Returns (intent or None, source, confidence); None means "ask the orchestrator"."""
+    if intent_model is not None:
+        prediction = intent_model.predict(user_input)
+        print(f"Model probabilities: {prediction.probabilities}")
+        if prediction.confidence >= MODEL_CONFIDENCE_THRESHOLD:
+            return prediction.intent, "model", prediction.confidence
 
-    # Course intent
-    if any(k in text for k in [
-        "course", "class", "take", "learn", "study", "subject", "degree"
-    ]):
-        return "course"
+    result = classify_intent(user_input)
+    print(f"Intent scores: {result.scores} (confidence {result.confidence})")
+    if result.confidence >= KEYWORD_CONFIDENCE_THRESHOLD or not ASK_ORCHESTRATOR_ON_LOW_CONFIDENCE:
+        return result.intent, "keywords", result.confidence
+    return None, "orchestrator", result.confidence
 
-    # Job intent
-    if any(k in text for k in [
-        "job", "internship", "career", "position", "opening", "hire", "work"
-    ]):
-        return "job"
 
-    # Fallback: assume course-related if learning-oriented
-    if "learn" in text or "study" in text:
-        return "course"
-
-    return "job"
+def get_parameter(event: dict, name: str):
+    for param in event.get("parameters") or []:
+        if param.get("name") == name:
+            return param.get("value")
+    return None
 
 # ===============================================================
 # 🧩 Agent invocation
 # ===============================================================
-def invoke_agent(agent_key: str, prompt: str) -> str:
+def invoke_agent(agent_key: str, prompt: str, caller: str = "anonymous", origin_session: str = "") -> str:
+    cached = agent_cache.get(agent_key, prompt, caller)
+    if cached is not None:
+        return cached
+
     agent_id, alias_id = AGENTS[agent_key]
-    print(f"→ Invoking {agent_key} agent with prompt: {prompt[:80]}...")
+    session_id, input_text = session_manager.begin_turn(agent_key, caller, prompt)
+    print(f"→ Invoking {agent_key} agent [session {session_id}] with prompt: {prompt[:80]}...")
 
     response = bedrock.invoke_agent(
         agentId=agent_id,
         agentAliasId=alias_id,
-        sessionId=f"session-{agent_key}",
-        inputText=prompt,
+        sessionId=session_id,
+        inputText=input_text,
+        # Action groups key their per-conversation state (job prefetches) on the frontend session
+        sessionState={"sessionAttributes": {"originSessionId": origin_session}} if origin_session else {},
+    )
+
+    reader = CompletionReader(response, max_chars=MAX_AGENT_OUTPUT_CHARS)
+    text = reader.read()
+    print(f"← {agent_key} agent metrics: {reader.metrics()}")
+
+    text = text.strip()
+    stats = session_manager.end_turn(agent_key, caller, input_text, text)
+    print(f"🧵 {agent_key} session size: {stats}; all sessions: {session_manager.snapshot()}")
+    if text and not reader.truncated:
+        agent_cache.put(agent_key, prompt, text, caller)
+    return text or "(No response generated.)"
+
+
+PROMPT_TEMPLATES = {
+    "job": "Find current job or internship opportunities related to {}.",
+    "course": "Suggest UTD courses that would help someone interested in {}.",
+    "project": "Generate creative and practical project ideas related to {}.",
+    "resume": "Provide feedback and suggestions to improve my resume for {}.",
+}
+
+
+def build_prompt(intent: str, user_input: str) -> str:
+    return PROMPT_TEMPLATES.get(intent, "Help me explore opportunities related to {}.").format(user_input)
+
+
+def answer_intent(intent: str, user_input: str, session_id: str = "", caller: str = "anonymous") -> str:
+    """The intent's tool result when it can be called directly, else the sub-agent's answer."""
+    direct = run_direct_tool(intent, user_input, session_id)
+    if direct is not None:
+        return direct
+    return invoke_agent(intent, build_prompt(intent, user_input), caller, session_id)
+
+# ===============================================================
+# 🌐 Concurrent fan-out for requests that span several intents
+# ===============================================================
+FANOUT_ENABLED = os.getenv("ROUTER_FANOUT", "1") == "1"
+FANOUT_TOP_K = int(os.getenv("ROUTER_FANOUT_K", "2"))
+FANOUT_MIN_SHARE = 0.4  # a runner-up intent must score at least this share of the top one
+FANOUT_DEADLINE_SECONDS = float(os.getenv("ROUTER_FANOUT_DEADLINE", "55"))  # Lambda timeout is 75s
+# Return as soon as one sub-agent gives a substantial answer instead of waiting for all
+FANOUT_FIRST_SUFFICIENT = os.getenv("ROUTER_FANOUT_FIRST_SUFFICIENT", "0") == "1"
+SUFFICIENT_ANSWER_CHARS = 400
+
+SECTION_TITLES = {
+    "job": "Job & internship openings",
+    "course": "Recommended courses",
+    "project": "Project ideas",
+    "resume": "Resume feedback",
+}
+
+
+def fanout_candidates(user_input: str, primary: str) -> list:
+    """The routed intent plus up to k-1 runner-ups that scored close to the top intent."""
+    if not FANOUT_ENABLED or FANOUT_TOP_K < 2:
+        return [primary]
+    scores = classify_intent(user_input).scores
+    top = max(scores.values())
+    if top <= 0:
+        return [primary]
+    runners_up = sorted(
+        (name for name, score in scores.items() if name != primary and score > 0 and score >= FANOUT_MIN_SHARE * top),
+        key=lambda name: -scores[name],
     )
+    return [primary] + runners_up[:FANOUT_TOP_K - 1]
+
 
-    text = ""
-    for event in response.get("completion", []):
-        if "chunk" in event and "bytes" in event["chunk"]:
-            text += event["chunk"]["bytes"].decode("utf-8", errors="ignore")
+def invoke_agents_concurrently(intents: list, user_input: str, session_id: str = "", caller: str = "anonymous",
+                               deadline: float = FANOUT_DEADLINE_SECONDS,
+                               first_sufficient: bool = FANOUT_FIRST_SUFFICIENT) -> str:
+    """
+    Invokes each intent's sub-agent in parallel under one deadline and merges
+    the answers into one response (sections in routing order). Agents that
+    fail or miss the deadline are noted and skipped.
+    """
+    start = time.time()
+    pool = ThreadPoolExecutor(max_workers=len(intents))
+    futures = {pool.submit(answer_intent, intent, user_input, session_id, caller): intent for intent in intents}
+    answers = {}
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            intent = futures[future]
+            try:
+                answers[intent] = future.result()
+            except Exception as e:
+                print(f"❌ {intent} agent failed during fan-out: {e}")
+                continue
+            if first_sufficient and len(answers[intent]) >= SUFFICIENT_ANSWER_CHARS:
+                print(f"🏁 {intent} agent gave a sufficient answer; not waiting for the rest")
+                break
+    except TimeoutError:
+        print(f"⏱️ Fan-out deadline ({deadline}s) reached with {len(answers)}/{len(intents)} answer(s)")
+    finally:
+        # Stragglers keep running in their threads; the response doesn't wait for them
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    return text.strip() or "(No response generated.)"
+    print(f"🌐 Fan-out over {intents} finished in {time.time() - start:.2f}s; answered: {list(answers)}")
+    if len(answers) == 1 and first_sufficient:
+        return next(iter(answers.values()))
+    sections = []
+    for intent in intents:
+        title = SECTION_TITLES.get(intent, intent.title())
+        body = answers.get(intent, f"(The {intent} advisor didn't return an answer.)")
+        sections.append(f"## {title}\n{body}")
+    return "\n\n".join(sections)
 
 # ===============================================================
 # 🚀 Lambda entry point
@@ -79,29 +201,48 @@ def lambda_handler(event, context):
     print("Incoming event:", json.dumps(event))
 
     # Extract raw input text
+    other_params = [p for p in event.get("parameters") or [] if p.get("name") != "intent"]
     user_input = (
         event.get("goal")
         or event.get("inputText")
-        or event.get("parameters", [{}])[0].get("value")
+        or get_parameter(event, "goal")
+        or (other_params[0].get("value") if other_params else None)
         or "help me find a job"
     ).strip()
 
-    intent = detect_intent(user_input)
+    # The orchestrator may name the sub-agent itself (e.g. after a low-confidence reply)
+    explicit_intent = str(get_parameter(event, "intent") or "").strip().lower()
+    if explicit_intent in AGENTS:
+        intent, source, confidence = explicit_intent, "orchestrator", 1.0
+    else:
+        intent, source, confidence = route_intent(user_input)
     print(f"Detected intent: {intent}")
+    # One JSON line per routing decision; `intent_model.py train --logs` reads these
+    print("ROUTING " + json.dumps({"text": user_input, "intent": intent, "source": source,
+                                   "confidence": confidence}))
 
-    # Build more natural prompts
-    if intent == "job":
-        prompt = f"Find current job or internship opportunities related to {user_input}."
-    elif intent == "course":
-        prompt = f"Suggest UTD courses that would help someone interested in {user_input}."
-    elif intent == "project":
-        prompt = f"Generate creative and practical project ideas related to {user_input}."
-    elif intent == "resume":
-        prompt = f"Provide feedback and suggestions to improve my resume for {user_input}."
-    else:
-        prompt = f"Help me explore opportunities related to {user_input}."
+    if intent is None:
+        return {
+            "response": {
+                "actionGroup": "CareerMatchingGroup",
+                "function": "generate_plan",
+                "functionResponse": {
+                    "responseBody": {"TEXT": {"body": (
+                        "The request could fit more than one advisor. Call generate_plan again with the "
+                        "parameter intent set to one of: " + ", ".join(AGENTS) + "."
+                    )}}
+                },
+            }
+        }
 
-    output = invoke_agent(intent, prompt)
+    # Requests spanning several intents ("a portfolio project and internships") fan out
+    candidates = [intent] if source == "orchestrator" else fanout_candidates(user_input, intent)
+    session_id = event.get("sessionId", "")
+    caller = caller_key(event)
+    if len(candidates) > 1:
+        output = invoke_agents_concurrently(candidates, user_input, session_id, caller)
+    else:
+        output = answer_intent(intent, user_input, session_id, caller)
 
     return {
         "response": {
@@ -112,3 +253,26 @@ def lambda_handler(event, context):
             },
         }
     }
+
+
+# ===============================================================
+# 🔥 INIT priming (see priming.py)
+# ===============================================================
+# One warm-up request per sub-agent, each against that agent's own id/alias,
+# runs in parallel, leaving as many pooled Bedrock connections as a full
+# fan-out uses.
+primer = Primer()
+
+for _agent_key, (_agent_id, _alias_id) in AGENTS.items():
+    primer.step(f"bedrock-agent-runtime ({_agent_key})")(
+        lambda agent_id=_agent_id, alias_id=_alias_id: warm_bedrock_agent_runtime(bedrock, agent_id, alias_id))
+
+
+@primer.step("lambda (direct tools)")
+def _prime_direct_tools():
+    if not DIRECT_TOOL_INTENTS:
+        return "direct tools disabled"
+    return warm_aws_connection(lambda_client.get_account_settings)
+
+
+primer.run()
@@ -0,0 +1,143 @@
+import re
+from typing import Dict, NamedTuple
+
+# ===============================================================
+# 🧭 Single-pass keyword intent classifier
+# ===============================================================
+# Every intent's keywords are compiled into one word-bounded alternation, so a
+# message is scanned once and all intents are scored together ("make" no
+# longer matches inside "homemaker", nor "work" inside "framework").
+# Run `python intent_classifier.py` for labeled accuracy and a timing benchmark.
+
+DEFAULT_INTENT = "job"
+# Tie-break order when two intents score the same (most specific first)
+INTENT_PRIORITY = ("resume", "project", "course", "job")
+
+# (regex fragment, weight); ambiguous words weigh less
+INTENT_KEYWORDS = {
+    "resume": [
+        (r"r[eé]sum[eé]s?", 2.0), (r"cvs?", 2.0), (r"cover letters?", 2.0), (r"linkedin", 1.5),
+        (r"bullet points?", 1.0), (r"ats", 1.0),
+    ],
+    "project": [
+        (r"projects?", 2.0), (r"portfolio", 1.5), (r"side projects?", 1.0), (r"hackathons?", 1.5),
+        (r"github", 1.0), (r"build(?:ing)?", 1.0), (r"create", 0.75), (r"make", 0.5), (r"ideas?", 0.75),
+        (r"develop", 0.75), (r"coding", 0.5), (r"apps?", 0.5),
+    ],
+    "course": [
+        (r"courses?", 2.0), (r"class(?:es)?", 2.0), (r"electives?", 2.0), (r"prerequisites?", 2.0),
+        (r"semesters?", 1.0), (r"credits?", 1.0), (r"degree", 1.0), (r"major", 1.0), (r"minor", 1.0),
+        (r"curriculum", 1.5), (r"subjects?", 1.0), (r"learn(?:ing)?", 0.75), (r"study(?:ing)?", 0.75),
+        (r"take", 0.5),
+        # Course codes like "CS 4375"; a number that looks like a year ("fall 2026", "IN 2026") isn't one
+        (r"[a-z]{2,4} ?(?!(?:19|20)\d\d)\d{4}", 2.0),
+    ],
+    "job": [
+        (r"jobs?", 2.0), (r"internships?", 2.0), (r"interns?", 1.5), (r"co-?ops?", 1.5), (r"openings?", 1.5),
+        (r"positions?", 1.5), (r"hiring", 1.5), (r"hire", 1.0), (r"employers?", 1.0), (r"roles?", 1.0),
+        (r"apply(?:ing)?", 1.0), (r"full[- ]time", 1.0), (r"part[- ]time", 1.0), (r"salar(?:y|ies)", 1.0),
+        (r"careers?", 0.5), (r"work", 0.5), (r"companies", 0.5),
+    ],
+}
+
+
+class IntentResult(NamedTuple):
+    intent: str
+    confidence: float
+    scores: Dict[str, float]
+
+
+def _compile(keywords):
+    fragments, groups = [], {}
+    for intent, entries in keywords.items():
+        for fragment, weight in entries:
+            name = f"k{len(groups)}"
+            groups[name] = (intent, weight)
+            fragments.append(f"(?P<{name}>{fragment})")
+    return re.compile(r"\b(?:" + "|".join(fragments) + r")\b", re.IGNORECASE), groups
+
+
+_PATTERN, _GROUPS = _compile(INTENT_KEYWORDS)
+
+
+def classify_intent(text: str) -> IntentResult:
+    """Scores all intents in one scan; confidence is the winner's share of the total score."""
+    scores = dict.fromkeys(INTENT_PRIORITY, 0.0)
+    for match in _PATTERN.finditer(text or ""):
+        intent, weight = _GROUPS[match.lastgroup]
+        scores[intent] += weight
+
+    total = sum(scores.values())
+    if total == 0:
+        return IntentResult(DEFAULT_INTENT, 0.0, scores)
+    intent = max(INTENT_PRIORITY, key=lambda name: (scores[name], -INTENT_PRIORITY.index(name)))
+    return IntentResult(intent, round(scores[intent] / total, 3), scores)
+
+
+# ===============================================================
+# 🧪 Labeled examples + benchmark
+# ===============================================================
+LABELED_EXAMPLES = [
+    ("Can you review my resume for software roles?", "resume"),
+    ("How should I word the bullet points on my CV", "resume"),
+    ("write a cover letter for a data analyst position", "resume"),
+    ("improve my linkedin profile", "resume"),
+    ("is my résumé ATS friendly", "resume"),
+    ("give me project ideas for machine learning", "project"),
+    ("what should I build for my portfolio", "project"),
+    ("side project ideas using react", "project"),
+    ("help me make a hackathon app", "project"),
+    ("what can I put on github to stand out", "project"),
+    ("how do I create a web scraper project", "project"),
+    ("which courses should I take for AI", "course"),
+    ("what electives are good for cybersecurity", "course"),
+    ("is CS 4375 hard", "course"),
+    ("should I take cs 1336 or cs 2336 first", "course"),
+    ("classes for a data science minor", "course"),
+    ("what are the prerequisites for machine learning", "course"),
+    ("plan my semester for a software engineering degree", "course"),
+    ("what should I study to learn cloud computing", "course"),
+    ("find me software engineering internships in Dallas", "job"),
+    ("are there any data analyst jobs near Austin", "job"),
+    ("who is hiring new grads for full-time roles", "job"),
+    ("part-time positions on campus", "job"),
+    ("entry level openings in cybersecurity", "job"),
+    ("summer co-op opportunities in Texas", "job"),
+    ("what companies hire interns for embedded systems", "job"),
+    ("I want to work in fintech", "job"),
+    ("help me find a job", "job"),
+    ("I use the django framework every day, any jobs?", "job"),
+    ("what does a homemaker career change look like", "job"),
+    ("salary range for junior developers", "job"),
+    ("software internships for fall 2026", "job"),
+    ("which companies are hiring in 2026", "job"),
+    ("Are there SWE roles IN 2026", "job"),
+    ("summer 2027 data science internships", "job"),
+]
+
+
+def evaluate(examples=LABELED_EXAMPLES) -> float:
+    correct = 0
+    for text, expected in examples:
+        result = classify_intent(text)
+        if result.intent == expected:
+            correct += 1
+        else:
+            print(f"  ✗ {text!r}: expected {expected}, got {result.intent} {result.scores}")
+    return correct / len(examples)
+
+
+def benchmark(iterations: int = 2000) -> float:
+    """Mean microseconds per classification over the labeled set."""
+    import time
+    texts = [text for text, _ in LABELED_EXAMPLES]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            classify_intent(text)
+    return (time.perf_counter() - start) / (iterations * len(texts)) * 1e6
+
+
+if __name__ == "__main__":
+    print(f"Accuracy: {evaluate():.1%} on {len(LABELED_EXAMPLES)} labeled examples")
+    print(f"Mean latency: {benchmark():.1f} µs per message")
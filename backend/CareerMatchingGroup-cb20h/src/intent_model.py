@@ -0,0 +1,205 @@
+import json
+import math
+import os
+import re
+import zlib
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# ===============================================================
+# 🤖 Hashed n-gram Naive Bayes intent model
+# ===============================================================
+# Multinomial Naive Bayes over hashed word uni/bigrams + character 3-grams.
+# Trained offline from logged (query, intent) pairs and saved as one compact
+# float32 file that is loaded at init; inference is a few dozen array lookups.
+# Confidence is a temperature-scaled softmax of the log posteriors (NB is
+# overconfident on its own; the temperature is fitted on held-out examples).
+#
+#   python intent_model.py train --logs queries.jsonl --seed --out intent_model.bin
+#   python intent_model.py eval --model intent_model.bin --logs queries.jsonl
+#
+# Router logs only yield training examples from orchestrator-labeled decisions,
+# and the router asks the orchestrator only with ROUTER_ASK_ORCHESTRATOR=1; turn
+# it on while collecting data (or pass --include-router to use its own guesses).
+
+MAGIC = b"NBIM1\n"
+HASH_BITS = 12
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+class Prediction(NamedTuple):
+    intent: str
+    confidence: float
+    probabilities: Dict[str, float]
+
+
+def features(text: str, dims: int = 1 << HASH_BITS) -> List[int]:
+    words = _WORD_RE.findall((text or "").lower())
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        grams += [padded[i:i + 3] for i in range(len(padded) - 2)]
+    return [zlib.crc32(g.encode("utf-8")) & (dims - 1) for g in grams]
+
+
+class NaiveBayesIntentModel:
+    def __init__(self, labels: Sequence[str], log_priors: array, log_likelihoods: array,
+                 hash_bits: int = HASH_BITS, temperature: float = 1.0):
+        self.labels = list(labels)
+        self.log_priors = log_priors
+        self.log_likelihoods = log_likelihoods  # row-major: label x bucket
+        self.hash_bits = hash_bits
+        self.dims = 1 << hash_bits
+        self.temperature = temperature
+
+    # ---------- inference ----------
+    def log_posteriors(self, text: str) -> List[float]:
+        buckets = features(text, self.dims)
+        ll, dims = self.log_likelihoods, self.dims
+        return [self.log_priors[k] + sum(ll[k * dims + b] for b in buckets) for k in range(len(self.labels))]
+
+    def predict(self, text: str) -> Prediction:
+        scores = [s / self.temperature for s in self.log_posteriors(text)]
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        probabilities = {label: round(e / total, 4) for label, e in zip(self.labels, exps)}
+        best = max(probabilities, key=probabilities.get)
+        return Prediction(best, probabilities[best], probabilities)
+
+    # ---------- training ----------
+    @classmethod
+    def train(cls, examples: Sequence[Tuple[str, str]], alpha: float = 0.5,
+              hash_bits: int = HASH_BITS) -> "NaiveBayesIntentModel":
+        """Fits on 4/5 of the examples, picks the temperature on the rest, then refits on everything."""
+        held_out = examples[::5]
+        fit_set = [ex for i, ex in enumerate(examples) if i % 5]
+        model = cls._fit(fit_set or examples, alpha, hash_bits)
+        if held_out and fit_set:
+            model.temperature = min((1.0, 2.0, 4.0, 8.0, 16.0, 32.0),
+                                    key=lambda t: model._nll(held_out, t))
+        final = cls._fit(examples, alpha, hash_bits)
+        final.temperature = model.temperature
+        return final
+
+    @classmethod
+    def _fit(cls, examples, alpha, hash_bits):
+        labels = sorted({label for _, label in examples})
+        dims = 1 << hash_bits
+        counts = [[0.0] * dims for _ in labels]
+        docs = [0] * len(labels)
+        for text, label in examples:
+            k = labels.index(label)
+            docs[k] += 1
+            for b in features(text, dims):
+                counts[k][b] += 1.0
+
+        log_priors = array("f", [math.log(d / len(examples)) for d in docs])
+        log_likelihoods = array("f")
+        for row in counts:
+            denom = sum(row) + alpha * dims
+            log_likelihoods.extend(math.log((c + alpha) / denom) for c in row)
+        return cls(labels, log_priors, log_likelihoods, hash_bits)
+
+    def _nll(self, examples, temperature: float) -> float:
+        saved, self.temperature = self.temperature, temperature
+        try:
+            return -sum(math.log(max(self.predict(text).probabilities.get(label, 0.0), 1e-6))
+                        for text, label in examples)
+        finally:
+            self.temperature = saved
+
+    # ---------- persistence ----------
+    def save(self, path: str) -> None:
+        header = {"labels": self.labels, "hash_bits": self.hash_bits, "temperature": self.temperature}
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            self.log_priors.tofile(f)
+            self.log_likelihoods.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayesIntentModel":
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an intent model file")
+            header = json.loads(f.readline())
+            n, dims = len(header["labels"]), 1 << header["hash_bits"]
+            log_priors, log_likelihoods = array("f"), array("f")
+            log_priors.fromfile(f, n)
+            log_likelihoods.fromfile(f, n * dims)
+        return cls(header["labels"], log_priors, log_likelihoods, header["hash_bits"], header["temperature"])
+
+
+def load_default_model() -> Optional[NaiveBayesIntentModel]:
+    """Model from INTENT_MODEL_PATH (default: intent_model.bin next to this file); None if absent."""
+    path = os.getenv("INTENT_MODEL_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_model.bin")
+    if not os.path.exists(path):
+        return None
+    try:
+        model = NaiveBayesIntentModel.load(path)
+        print(f"🤖 Loaded intent model {path} (labels={model.labels}, T={model.temperature})")
+        return model
+    except (OSError, ValueError, KeyError, EOFError) as e:
+        print(f"⚠️ Could not load intent model {path}: {e}")
+        return None
+
+
+def examples_from_logs(path: str, include_router: bool = False) -> Iterable[Tuple[str, str]]:
+    """
+    Logged queries as JSON lines: {"text": "...", "intent": "job"}. Router log
+    lines ("ROUTING {...}") work as-is, but only decisions whose source is
+    "orchestrator" are kept unless include_router is set: the others are the
+    router's own guesses, and training on them would only reinforce its mistakes.
+    Lines without a source (hand-labeled files) are always kept.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            start = line.find("{")
+            if start < 0:
+                continue
+            try:
+                record = json.loads(line[start:])
+            except ValueError:
+                continue
+            if record.get("source", "orchestrator") != "orchestrator" and not include_router:
+                continue
+            if record.get("text") and record.get("intent"):
+                yield record["text"], record["intent"]
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from intent_classifier import LABELED_EXAMPLES
+
+    parser = argparse.ArgumentParser(description="Train / evaluate the router's intent model.")
+    parser.add_argument("command", choices=["train", "eval"])
+    parser.add_argument("--logs", action="append", default=[], help="JSONL of {text, intent}; repeatable")
+    parser.add_argument("--seed", action="store_true", help="include intent_classifier.LABELED_EXAMPLES")
+    parser.add_argument("--include-router", action="store_true",
+                        help="also train on the router's own (model / keyword) decisions from --logs")
+    parser.add_argument("--model", default="intent_model.bin")
+    parser.add_argument("--out", default="intent_model.bin")
+    args = parser.parse_args()
+
+    data = [ex for path in args.logs for ex in examples_from_logs(path, args.include_router)]
+    if args.logs and not data:
+        parser.error("--logs gave no examples: only orchestrator-labeled ROUTING lines are used, and those "
+                     "are only logged with ROUTER_ASK_ORCHESTRATOR=1 (or pass --include-router)")
+    if args.seed or not args.logs:
+        data += LABELED_EXAMPLES
+
+    if args.command == "train":
+        trained = NaiveBayesIntentModel.train(data)
+        trained.save(args.out)
+        print(f"Trained on {len(data)} examples -> {args.out} ({os.path.getsize(args.out)} bytes, "
+              f"T={trained.temperature})")
+    else:
+        loaded = NaiveBayesIntentModel.load(args.model)
+        correct = sum(loaded.predict(text).intent == label for text, label in data)
+        start = time.perf_counter()
+        for text, _ in data * 200:
+            loaded.predict(text)
+        mean_us = (time.perf_counter() - start) / (len(data) * 200) * 1e6
+        print(f"Accuracy: {correct / len(data):.1%} on {len(data)} examples; {mean_us:.1f} µs per prediction")
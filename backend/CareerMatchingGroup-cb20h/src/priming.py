@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+# === INIT-phase priming ===
+# A handler module registers warm-up steps (client creation, connection set-up,
+# secret and cache loads) and calls primer.run() at the end of the module, so
+# they happen during Lambda INIT rather than on the first request. Steps run in
+# parallel threads; the import waits at most PRIMING_BUDGET_SECONDS and a step
+# still running after that finishes in the background. Priming runs only inside
+# Lambda: PRIMING=1 forces it locally, PRIMING=0 turns it off. Each Lambda
+# deploys its own copy of this module.
+
+PRIMING_BUDGET_SECONDS = float(os.getenv("PRIMING_BUDGET_SECONDS", "2.0"))
+
+
+def priming_enabled() -> bool:
+    setting = os.getenv("PRIMING", "auto")
+    if setting in ("0", "1"):
+        return setting == "1"
+    return bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+
+
+class Primer:
+    def __init__(self, budget_seconds: float = PRIMING_BUDGET_SECONDS):
+        self.budget_seconds = budget_seconds
+        self._steps: List[Tuple[str, Callable]] = []
+        self.results: Dict[str, dict] = {}
+
+    def step(self, name: str):
+        """Decorator registering a warm-up step; a string it returns is logged as detail."""
+        def register(fn):
+            self._steps.append((name, fn))
+            return fn
+        return register
+
+    def _run_step(self, name: str, fn: Callable) -> None:
+        started = time.perf_counter()
+        try:
+            detail, status = fn(), "ok"
+        except Exception as e:
+            detail, status = str(e)[:200], "failed"
+        self.results[name] = {"status": status, "ms": round((time.perf_counter() - started) * 1000, 1),
+                              "detail": detail}
+
+    def run(self) -> Dict[str, dict]:
+        if not self._steps or not priming_enabled():
+            return self.results
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.budget_seconds
+        threads = []
+        for name, fn in self._steps:
+            thread = threading.Thread(target=self._run_step, args=(name, fn), name=f"prime-{name}", daemon=True)
+            thread.start()
+            threads.append((name, thread))
+        for _, thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        for name, _ in threads:
+            result = self.results.get(name)
+            if result is None:
+                print(f"⏳ Priming {name} still running after the {self.budget_seconds}s budget; "
+                      f"finishing in the background")
+            elif result["status"] == "ok":
+                detail = f" ({result['detail']})" if result["detail"] else ""
+                print(f"🔥 Primed {name} in {result['ms']} ms{detail}")
+            else:
+                print(f"⚠️ Priming {name} failed after {result['ms']} ms: {result['detail']}")
+        primed = sum(1 for r in self.results.values() if r["status"] == "ok")
+        print(f"🔥 Priming finished in {round((time.perf_counter() - started) * 1000)} ms: "
+              f"{primed}/{len(threads)} step(s) primed")
+        return self.results
+
+
+def warm_aws_connection(call: Callable) -> str:
+    """
+    Runs a cheap request so the client's pooled TLS connection is open. An error
+    answer from the service (not found, access denied) still comes back over
+    that connection, so it counts as warmed.
+    """
+    try:
+        call()
+        return "connected"
+    except Exception as e:
+        code = (getattr(e, "response", None) or {}).get("Error", {}).get("Code")
+        if code:
+            return f"connected ({code})"
+        raise
+
+
+def warm_bedrock_agent_runtime(client, agent_id: str, agent_alias_id: str) -> str:
+    # Memory lookup on an agent the Lambda really invokes: no agent run, no tokens
+    return warm_aws_connection(lambda: client.get_agent_memory(
+        agentId=agent_id, agentAliasId=agent_alias_id, memoryId="priming",
+        memoryType="SESSION_SUMMARY", maxItems=1))
+
+
+def warm_dynamodb(client, table_name: str) -> str:
+    return warm_aws_connection(lambda: client.get_item(TableName=table_name, Key={"priming": {"S": "priming"}}))
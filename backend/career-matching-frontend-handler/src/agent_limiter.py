@@ -0,0 +1,146 @@
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+# === Adaptive concurrency limit + retry budget for invoke_agent ===
+# AIMD: every success grows the limit by 1/limit (≈ +1 per window), every
+# throttle halves it. Callers over the limit wait briefly in a queue instead
+# of failing; throttled calls are retried with full jitter until a total
+# time budget runs out.
+
+# Compared case-insensitively: errors inside the completion stream use camelCase (throttlingException)
+THROTTLE_CODES = {"throttlingexception", "toomanyrequestsexception", "servicequotaexceededexception"}
+TRANSIENT_CODES = {"internalserverexception", "dependencyfailedexception", "serviceunavailableexception",
+                   "badgatewayexception", "modelnotreadyexception"}
+
+
+class AgentBusyError(Exception):
+    """No capacity within the queue wait / retry budget; `retry_after` is a hint in seconds."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PartialReplyError(Exception):
+    """The completion stream failed after part of the reply was delivered; not retried (it would repeat)."""
+
+
+def error_code(error: Exception) -> str:
+    response = getattr(error, "response", None) or {}
+    return (response.get("Error") or {}).get("Code") or type(error).__name__
+
+
+def is_throttle(error: Exception) -> bool:
+    if isinstance(error, PartialReplyError) and error.__cause__ is not None:
+        error = error.__cause__
+    return error_code(error).lower() in THROTTLE_CODES or "throttl" in str(error).lower()
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, PartialReplyError):
+        return False
+    return (is_throttle(error) or error_code(error).lower() in TRANSIENT_CODES
+            or isinstance(error, (ConnectionError, TimeoutError)))
+
+
+class AdaptiveLimiter:
+    def __init__(self, initial_limit: float = 4, min_limit: float = 1, max_limit: float = 32,
+                 backoff_factor: float = 0.5):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.backoff_factor = backoff_factor
+        self.in_flight = 0
+        self.queued = 0
+        self.throttled = 0
+        self.rejected = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self.queued += 1
+            try:
+                while self.in_flight >= int(self.limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        return False
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                return True
+            finally:
+                self.queued -= 1
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+            self._cond.notify()
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            self.throttled += 1
+            self.limit = max(self.min_limit, self.limit * self.backoff_factor)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+        }
+
+
+class AgentGate:
+    """
+    Runs a call under the limiter with jittered retries inside a total time budget.
+    The call should cover the whole agent run (invoke + reading the completion), so
+    the slot is held while the agent works and in-stream throttles are counted.
+    """
+
+    def __init__(self, limiter: Optional[AdaptiveLimiter] = None, max_queue_wait: float = 3.0,
+                 total_budget: float = 20.0, base_delay: float = 0.25, max_delay: float = 4.0,
+                 max_attempts: int = 5):
+        self.limiter = limiter or AdaptiveLimiter()
+        self.max_queue_wait = max_queue_wait
+        self.total_budget = total_budget
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+
+    def call(self, fn: Callable[[], object]):
+        started = time.monotonic()
+        if not self.limiter.acquire(self.max_queue_wait):
+            raise AgentBusyError("Agent is at capacity; try again shortly.", retry_after=self.max_queue_wait)
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    result = fn()
+                    self.limiter.on_success()
+                    return result
+                except Exception as e:
+                    throttled = is_throttle(e)
+                    if throttled:
+                        self.limiter.on_throttle()
+                    delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+                    out_of_budget = time.monotonic() - started + delay > self.total_budget
+                    if not is_retryable(e) or attempt >= self.max_attempts or out_of_budget:
+                        if throttled:
+                            raise AgentBusyError(f"Agent throttled after {attempt} attempt(s): {e}",
+                                                 retry_after=max(1.0, self.max_delay)) from e
+                        raise
+                    print(f"🔁 invoke_agent attempt {attempt} failed ({error_code(e)}); retrying in {delay:.2f}s "
+                          f"limiter={self.limiter.snapshot()}")
+                    time.sleep(delay)
+        finally:
+            self.limiter.release()
@@ -0,0 +1,82 @@
+import codecs
+import time
+from typing import Iterator, Optional
+
+# === Incremental reader for invoke_agent completion streams ===
+# Chunk bytes go through an incremental UTF-8 decoder, so a character split
+# across two chunks is reassembled instead of dropped, and text is collected
+# in a list and joined once instead of `text += ...` per chunk.
+
+
+class CompletionReader:
+    """
+    Iterating yields decoded text as chunks arrive; `read()` drains the stream
+    and returns the whole reply. With `max_chars` the reader stops (and closes
+    the stream) once that much text has been produced.
+    """
+
+    def __init__(self, response: dict, max_chars: Optional[int] = None, started_at: Optional[float] = None):
+        self.response = response
+        self.max_chars = max_chars
+        self.started_at = started_at if started_at is not None else time.time()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._parts = []
+        self.chars = 0
+        self.chunks = 0
+        self.bytes = 0
+        self.first_chunk_at = None
+        self.finished_at = None
+        self.truncated = False
+
+    def _take(self, text: str) -> str:
+        if self.max_chars is not None and self.chars + len(text) > self.max_chars:
+            text = text[:self.max_chars - self.chars]
+            self.truncated = True
+        if text:
+            self._parts.append(text)
+            self.chars += len(text)
+        return text
+
+    def __iter__(self) -> Iterator[str]:
+        stream = self.response.get("completion") or []
+        try:
+            for event in stream:
+                chunk = event.get("chunk") or {}
+                data = chunk.get("bytes")
+                if not data:
+                    continue
+                if self.first_chunk_at is None:
+                    self.first_chunk_at = time.time()
+                self.chunks += 1
+                self.bytes += len(data)
+                text = self._take(self._decoder.decode(data))
+                if text:
+                    yield text
+                if self.truncated:
+                    return
+            text = self._take(self._decoder.decode(b"", final=True))
+            if text:
+                yield text
+        finally:
+            self.finished_at = time.time()
+            if self.truncated and hasattr(stream, "close"):
+                stream.close()
+
+    def read(self) -> str:
+        for _ in self:
+            pass
+        return self.text()
+
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def metrics(self) -> dict:
+        finished_at = self.finished_at or time.time()
+        return {
+            "first_chunk_ms": round((self.first_chunk_at - self.started_at) * 1000) if self.first_chunk_at else None,
+            "total_ms": round((finished_at - self.started_at) * 1000),
+            "chunks": self.chunks,
+            "bytes": self.bytes,
+            "chars": self.chars,
+            "truncated": self.truncated,
+        }
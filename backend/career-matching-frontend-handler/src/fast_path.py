@@ -0,0 +1,140 @@
+import json
+import os
+import re
+import time
+from typing import Optional, Tuple
+
+# === Local fast path for quick-start buttons and small talk ===
+# The UI's quick-start buttons send fixed strings and greetings carry no
+# question, so both are answered here without a Bedrock agent run. The chat
+# buttons send "I need help with <title>" (ChatBot.tsx) and the sidebar sends
+# the longer prompts in QUICK_START_PROMPTS (Sidebar.tsx); keep them in sync.
+
+QUICK_START_ANSWERS = {
+    "resume advice": (
+        "I'd be glad to help with your resume! Attach it with the 📎 button and tell me the kind of role "
+        "you're targeting (for example \"software engineering internship\"), and I'll point out what to "
+        "strengthen: impact-focused bullet points, relevant skills and projects, and formatting."
+    ),
+    "job search": (
+        "Let's find you some openings! Tell me the role you're after, where you'd like to work (a city or "
+        "\"remote\"), and whether you want an internship or a full-time position, and I'll pull current listings."
+    ),
+    "course planning": (
+        "Happy to help plan your courses! Tell me your major, what you've already taken, and the career or "
+        "skills you're aiming for (for example machine learning or cybersecurity), and I'll suggest UTD "
+        "courses that fit."
+    ),
+    "interview prep": (
+        "Let's get you ready! Tell me the company or role you're interviewing for and I can walk you through "
+        "likely behavioral questions (use the STAR format), the technical topics to review, and good questions "
+        "to ask your interviewer."
+    ),
+}
+
+# Sidebar prompt -> QUICK_START_ANSWERS key
+QUICK_START_PROMPTS = {
+    "I need help improving my resume. Can you review it and provide suggestions?": "resume advice",
+    "I'm looking for job opportunities in my field. Can you help me with my job search strategy?": "job search",
+    "I need help planning my course schedule for next semester. What courses should I consider?": "course planning",
+    "I have an interview coming up. Can you help me prepare with common questions and tips?": "interview prep",
+}
+_QUICK_START_PREFIX_RE = re.compile(r"^i need help with ")
+
+SMALL_TALK = (
+    ("greeting", re.compile(r"^(?:hi+|hello+|hey+|hiya|howdy|yo|good (?:morning|afternoon|evening))(?: there)?(?: eida)?$"),
+     "Hi there! I'm Eida, your UTD career and academic advisor. I can help with your resume, job and "
+     "internship searches, course planning, and interview prep. What would you like to work on?"),
+    ("thanks", re.compile(r"^(?:thanks?(?: you)?(?: so much| a lot)?|thank u|thx|ty|appreciate it)$"),
+     "You're welcome! Let me know if there's anything else I can help with."),
+    ("goodbye", re.compile(r"^(?:bye+|goodbye|see (?:you|ya)(?: later)?|that'?s all)$"),
+     "Good luck! Come back any time you need help with jobs, courses or your resume."),
+    ("capabilities", re.compile(r"^(?:help|what can you do|who are you|what are you)$"),
+     "I'm Eida, an AI advisor for UTD students. I can review your resume, find current job and internship "
+     "listings, suggest courses for your goals, recommend portfolio projects, and help you prep for interviews."),
+)
+
+_NORMALIZE_RE = re.compile(r"[^a-z' ]+")
+REFRESH_INTERVAL = int(os.getenv("FAST_PATH_REFRESH_SECONDS", "900"))
+
+
+def normalize(message: str) -> str:
+    return " ".join(_NORMALIZE_RE.sub(" ", (message or "").lower()).split())
+
+
+class FastPathResponder:
+    """
+    Answers fixed prompts and trivial messages locally and counts the agent
+    invocations that saved. Quick-start answers can be refreshed periodically
+    from a JSON file ({"job search": "...", ...}) named by FAST_PATH_ANSWERS_PATH.
+    """
+
+    def __init__(self, answers_path: Optional[str] = None):
+        self.answers = dict(QUICK_START_ANSWERS)
+        self.prompts = {normalize(prompt): key for prompt, key in QUICK_START_PROMPTS.items()}
+        self.answers_path = answers_path if answers_path is not None else os.getenv("FAST_PATH_ANSWERS_PATH")
+        self._loaded_at = 0.0
+        self.metrics = {"avoided_invocations": 0}
+        self._refresh()
+
+    def _refresh(self) -> None:
+        if not self.answers_path or time.time() - self._loaded_at < REFRESH_INTERVAL:
+            return
+        self._loaded_at = time.time()
+        try:
+            with open(self.answers_path, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+            self.answers.update({normalize(k): v for k, v in overrides.items() if isinstance(v, str) and v})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Fast-path answers refresh failed: {e}")
+
+    def classify(self, message: str) -> Optional[Tuple[str, str]]:
+        """Returns (kind, reply) when the message can be answered locally."""
+        text = normalize(message)
+        if not text:
+            return None
+        key = self.prompts.get(text) or _QUICK_START_PREFIX_RE.sub("", text)
+        if key in self.answers:
+            return f"quick_start:{key}", self.answers[key]
+        for kind, pattern, reply in SMALL_TALK:
+            if pattern.match(text):
+                return kind, reply
+        return None
+
+    def respond(self, message: str) -> Optional[str]:
+        self._refresh()
+        match = self.classify(message)
+        if match is None:
+            return None
+        kind, reply = match
+        self.metrics["avoided_invocations"] += 1
+        self.metrics[kind] = self.metrics.get(kind, 0) + 1
+        print(f"🏎️ Fast path answered '{kind}' without Bedrock; metrics={self.metrics}")
+        return reply
+
+
+# Strings the UI actually sends, with the kind they should be answered as
+EXAMPLES = [
+    ("I need help with resume advice", "quick_start:resume advice"),
+    ("I need help with job search", "quick_start:job search"),
+    ("I need help with course planning", "quick_start:course planning"),
+    ("I need help with interview prep", "quick_start:interview prep"),
+    *((prompt, f"quick_start:{key}") for prompt, key in QUICK_START_PROMPTS.items()),
+    ("resume advice", "quick_start:resume advice"),
+    ("Hi there!", "greeting"),
+    ("thank you so much", "thanks"),
+    ("I need help with my resume for a data analyst role", None),
+    ("find software internships in Dallas", None),
+]
+
+
+if __name__ == "__main__":
+    responder = FastPathResponder()
+    failures = 0
+    for message, expected in EXAMPLES:
+        match = responder.classify(message)
+        kind = match[0] if match else None
+        if kind != expected:
+            failures += 1
+            print(f"  ✗ {message!r}: expected {expected}, got {kind}")
+    print(f"{len(EXAMPLES) - failures}/{len(EXAMPLES)} fast-path examples answered as expected")
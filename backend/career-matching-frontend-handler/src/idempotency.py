@@ -0,0 +1,177 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# === Idempotency keys for /chat ===
+# A client sends the same Idempotency-Key header (or "idempotencyKey" body
+# field) on every retry of one message. The first request claims the key and
+# runs the agent; duplicates that arrive while it runs wait for it and get its
+# response, and later duplicates get the stored response without a new run.
+
+COMPLETED_TTL = int(os.getenv("IDEMPOTENCY_TTL", "600"))  # how long a finished reply is replayed
+IN_FLIGHT_TTL = 150                                       # claim expiry; > Lambda timeout (135s)
+JOIN_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_JOIN_WAIT", "25"))
+
+_KEY_SAFE_RE = re.compile(r"[^0-9a-zA-Z._:-]")
+
+
+def idempotency_key(headers: dict, body: dict, session_id: str) -> Optional[str]:
+    """Client key scoped to the caller's session, so two users can't collide on a key."""
+    key = headers.get("idempotency-key") or headers.get("x-idempotency-key") or body.get("idempotencyKey")
+    if not key:
+        return None
+    return f"{session_id}:{_KEY_SAFE_RE.sub('-', str(key).strip())[:64]}"
+
+
+class InMemoryIdempotencyStore:
+    """Bounded, per-container stand-in."""
+
+    poll_interval = 0.1
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry["expires_at"] > now:
+                return False
+            self._entries[key] = {"status": "in_flight", "expires_at": now + IN_FLIGHT_TTL}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry) if entry and entry["expires_at"] > time.time() else None
+
+    def complete(self, key: str, response: dict) -> None:
+        with self._lock:
+            self._entries[key] = {"status": "done", "response": response, "expires_at": time.time() + COMPLETED_TTL}
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DynamoIdempotencyStore:
+    """Shared store (partition key `idem_key`, TTL attribute `expires_at`); claims are conditional puts."""
+
+    poll_interval = 0.5
+
+    def __init__(self, dynamodb_client, table_name: str):
+        self.dynamo = dynamodb_client
+        self.table_name = table_name
+
+    def claim(self, key: str) -> bool:
+        now = time.time()
+        try:
+            self.dynamo.put_item(
+                TableName=self.table_name,
+                Item={
+                    "idem_key": {"S": key},
+                    "status": {"S": "in_flight"},
+                    "expires_at": {"N": str(int(now + IN_FLIGHT_TTL))},
+                },
+                # Expired records may still be present until DynamoDB's TTL sweep removes them
+                ConditionExpression="attribute_not_exists(idem_key) OR expires_at < :now",
+                ExpressionAttributeValues={":now": {"N": str(int(now))}},
+            )
+            return True
+        except Exception as e:
+            if "ConditionalCheckFailed" in str(e) or "ConditionalCheckFailed" in type(e).__name__:
+                return False
+            # Store unavailable: don't block the request over it
+            print(f"⚠️ Idempotency claim failed: {e}")
+            return True
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            item = self.dynamo.get_item(TableName=self.table_name, Key={"idem_key": {"S": key}},
+                                        ConsistentRead=True).get("Item")
+        except Exception as e:
+            print(f"⚠️ Idempotency read failed: {e}")
+            return None
+        if not item or float(item["expires_at"]["N"]) <= time.time():
+            return None
+        entry = {"status": item["status"]["S"]}
+        if "response" in item:
+            entry["response"] = json.loads(item["response"]["S"])
+        return entry
+
+    def complete(self, key: str, response: dict) -> None:
+        try:
+            self.dynamo.put_item(TableName=self.table_name, Item={
+                "idem_key": {"S": key},
+                "status": {"S": "done"},
+                "response": {"S": json.dumps(response)},
+                "expires_at": {"N": str(int(time.time() + COMPLETED_TTL))},
+            })
+        except Exception as e:
+            print(f"⚠️ Idempotency write failed: {e}")
+
+    def release(self, key: str) -> None:
+        try:
+            self.dynamo.delete_item(TableName=self.table_name, Key={"idem_key": {"S": key}})
+        except Exception as e:
+            print(f"⚠️ Idempotency release failed: {e}")
+
+
+def build_idempotency_store():
+    table = os.getenv("IDEMPOTENCY_TABLE")
+    if table:
+        from aws_clients import lazy_client
+        return DynamoIdempotencyStore(lazy_client("dynamodb"), table)
+    return InMemoryIdempotencyStore()
+
+
+class IdempotencyGuard:
+    def __init__(self, store=None, join_wait: float = JOIN_WAIT_SECONDS):
+        self.store = store or build_idempotency_store()
+        self.join_wait = join_wait
+        self.metrics = {"claimed": 0, "replayed": 0, "joined": 0, "still_running": 0}
+
+    def begin(self, key: str) -> Optional[dict]:
+        """
+        None when this request owns the key (run it, then complete() or release()).
+        Otherwise the entry for the original request: {"status": "done", "response": ...}
+        once it finished (waiting up to join_wait for an in-flight one), else {"status": "in_flight"}.
+        """
+        if self.store.claim(key):
+            self.metrics["claimed"] += 1
+            return None
+
+        deadline = time.monotonic() + self.join_wait
+        joined = False
+        while True:
+            entry = self.store.get(key)
+            if entry is None:
+                # Original run failed and released the key; this retry takes over
+                if self.store.claim(key):
+                    self.metrics["claimed"] += 1
+                    return None
+            elif entry["status"] == "done":
+                self.metrics["joined" if joined else "replayed"] += 1
+                print(f"♻️ Idempotent replay for {key} ({'joined in-flight run' if joined else 'stored reply'}); "
+                      f"metrics={self.metrics}")
+                return entry
+            if time.monotonic() >= deadline:
+                self.metrics["still_running"] += 1
+                return {"status": "in_flight"}
+            joined = True
+            time.sleep(self.store.poll_interval)
+
+    def complete(self, key: str, response: dict) -> None:
+        self.store.complete(key, response)
+
+    def release(self, key: str) -> None:
+        self.store.release(key)
@@ -0,0 +1,94 @@
+import json
+import os
+import re
+import threading
+from typing import Optional, Tuple
+
+# === Speculative job-search prefetch ===
+# When a message is clearly a job search, the serpapi Lambda is async-invoked
+# with {"prefetch": true, ...} from a background thread before the agent runs.
+# The search result lands in that Lambda's prefetch cache (keyed by the agent
+# session id), so the agent's action group call later finds it warm and
+# SerpAPI latency overlaps with model latency instead of adding to it.
+
+_JOB_WORDS_RE = re.compile(r"\b(?:jobs?|internships?|co-?ops?|openings?|positions?|roles?|hiring|listings?)\b")
+# Job-adjacent questions the agent answers without searching listings
+_NOT_A_SEARCH_RE = re.compile(
+    r"\b(?:resumes?|cvs?|cover letters?|interview\w*|courses?|class(?:es)?|projects?|salar(?:y|ies)|negotiat\w*|prepar\w*|advice|tips?)\b"
+)
+_LOCATION_RE = re.compile(r"\b(?:in|near|around)\s+([a-z][a-z .'-]*?)\s*(?:,\s*[a-z .]+)?\s*[?.!]*$")
+_LEADING_FILLER_RE = re.compile(
+    r"^(?:please\s+|(?:what|which|are there)\s+|(?:can|could|would|will)\s+you\s+|i(?:'m| am)\s+|i\s+(?:want|need)\s+(?:to\s+)?|"
+    r"(?:looking|searching|look|search)(?:\s+for)?\s+|(?:find|show|get|list|give)(?:\s+me)?\s+|"
+    r"(?:some|any|a few|open|current|available|new)\s+)+"
+)
+_TRAILING_FILLER_RE = re.compile(
+    r"\s+(?:please|for me|right now|currently|now|(?:are|is)\s+(?:there|open|available|hiring)|(?:are|is)\s+out there)$"
+)
+_MAX_QUERY_WORDS = 8
+
+
+def guess_job_search(message: str) -> Optional[Tuple[str, Optional[str]]]:
+    """(query, location) when the message is a job/internship search; None otherwise."""
+    text = " ".join((message or "").lower().split())
+    if not _JOB_WORDS_RE.search(text) or _NOT_A_SEARCH_RE.search(text):
+        return None
+
+    location = None
+    match = _LOCATION_RE.search(text)
+    if match:
+        location = match.group(1).strip().title() or None
+        text = text[:match.start()]
+
+    query = _TRAILING_FILLER_RE.sub("", _LEADING_FILLER_RE.sub("", text.strip(" ?.!"))).strip(" ?.!,")
+    words = query.split()
+    if not words or len(words) > _MAX_QUERY_WORDS:
+        return None
+    return query, location
+
+
+class JobPrefetcher:
+    """Fires the speculative search; disabled with JOB_PREFETCH=0."""
+
+    def __init__(self, function_name: Optional[str] = None, enabled: Optional[bool] = None):
+        self.function_name = function_name or os.getenv("SERPAPI_LAMBDA_NAME") or "serpapi-google-jobs"
+        self.enabled = enabled if enabled is not None else os.getenv("JOB_PREFETCH", "1") != "0"
+        self._client = None
+        self.metrics = {"prefetched": 0, "skipped": 0, "errors": 0}
+
+    def _lambda(self):
+        if self._client is None:
+            from aws_clients import get_client
+            self._client = get_client("lambda")
+        return self._client
+
+    def _invoke(self, payload: dict) -> None:
+        try:
+            self._lambda().invoke(FunctionName=self.function_name, InvocationType="Event",
+                                  Payload=json.dumps(payload).encode("utf-8"))
+        except Exception as e:
+            self.metrics["errors"] += 1
+            print(f"⚠️ Job prefetch invoke failed: {e}")
+
+    def maybe_prefetch(self, session_id: str, message: str) -> Optional[threading.Thread]:
+        """
+        Starts the prefetch in a background thread and returns it. The Event invoke
+        returns in milliseconds, long before the agent run this overlaps with ends.
+        """
+        guess = guess_job_search(message) if self.enabled else None
+        if guess is None:
+            self.metrics["skipped"] += 1
+            return None
+
+        query, location = guess
+        self.metrics["prefetched"] += 1
+        print(f"🔮 Prefetching job search '{query}'" + (f" in {location}" if location else "") +
+              f" [session {session_id}]")
+        thread = threading.Thread(target=self._invoke, daemon=True, args=({
+            "prefetch": True,
+            "sessionId": session_id,
+            "query": query,
+            "location": location,
+        },))
+        thread.start()
+        return thread
@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+# === Async agent jobs ===
+# POST returns a job id right away; a worker runs the agent and appends reply
+# chunks to the job; the client polls (or long-polls) for new chunks and the
+# final answer. The store is pluggable: in-memory (+ a thread worker) locally,
+# DynamoDB (+ an async self-invocation as the worker) when ASYNC_JOB_TABLE is set.
+
+JOB_TTL = 3600
+TERMINAL_STATUSES = ("done", "failed")
+MAX_LONG_POLL_SECONDS = 20.0
+
+
+def new_job(session_id: str, input_text: str, message: str) -> dict:
+    now = time.time()
+    return {
+        "job_id": uuid.uuid4().hex,
+        "status": "pending",
+        "session_id": session_id,
+        "input": input_text,
+        "message": message,
+        "chunks": [],
+        "reply": None,
+        "error": None,
+        "metrics": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+class InMemoryJobStore:
+    """Local stand-in; only visible inside this container."""
+
+    poll_interval = 0.2
+
+    def __init__(self, max_jobs: int = 200):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, job: dict) -> None:
+        with self._lock:
+            self._jobs[job["job_id"]] = json.loads(json.dumps(job))
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job.update(fields, updated_at=time.time())
+
+    def append_chunks(self, job_id: str, chunks: List[str]) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job["chunks"].extend(chunks)
+                job["updated_at"] = time.time()
+
+
+class DynamoJobStore:
+    """Shared store: partition key `job_id`, TTL attribute `expires_at`."""
+
+    poll_interval = 0.5
+
+    def __init__(self, dynamodb_client, table_name: str):
+        self.dynamo = dynamodb_client
+        self.table_name = table_name
+
+    def create(self, job: dict) -> None:
+        item = {
+            "job_id": {"S": job["job_id"]},
+            "status": {"S": job["status"]},
+            "job": {"S": json.dumps({k: v for k, v in job.items() if k != "chunks"})},
+            "chunks": {"L": []},
+            "expires_at": {"N": str(int(time.time() + JOB_TTL))},
+        }
+        self.dynamo.put_item(TableName=self.table_name, Item=item)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        item = self.dynamo.get_item(TableName=self.table_name, Key={"job_id": {"S": job_id}},
+                                    ConsistentRead=True).get("Item")
+        if not item:
+            return None
+        job = json.loads(item["job"]["S"])
+        job["status"] = item["status"]["S"]
+        job["chunks"] = [c["S"] for c in item.get("chunks", {}).get("L", [])]
+        for field in ("reply", "error", "metrics"):
+            if field in item:
+                job[field] = json.loads(item[field]["S"])
+        return job
+
+    def update(self, job_id: str, **fields) -> None:
+        names, values, sets = {}, {}, []
+        for i, (field, value) in enumerate(fields.items()):
+            names[f"#f{i}"] = field
+            values[f":v{i}"] = {"S": value} if field == "status" else {"S": json.dumps(value)}
+            sets.append(f"#f{i} = :v{i}")
+        self.dynamo.update_item(TableName=self.table_name, Key={"job_id": {"S": job_id}},
+                                UpdateExpression="SET " + ", ".join(sets),
+                                ExpressionAttributeNames=names, ExpressionAttributeValues=values)
+
+    def append_chunks(self, job_id: str, chunks: List[str]) -> None:
+        self.dynamo.update_item(
+            TableName=self.table_name, Key={"job_id": {"S": job_id}},
+            UpdateExpression="SET chunks = list_append(if_not_exists(chunks, :empty), :c)",
+            ExpressionAttributeValues={":empty": {"L": []}, ":c": {"L": [{"S": c} for c in chunks]}},
+        )
+
+
+class ChunkBatcher:
+    """Groups small completion chunks so a shared store isn't written once per token."""
+
+    def __init__(self, store, job_id: str, min_chars: int = 200, max_delay: float = 0.5):
+        self.store = store
+        self.job_id = job_id
+        self.min_chars = min_chars
+        self.max_delay = max_delay
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, text: str) -> None:
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= self.min_chars or time.monotonic() - self._last_flush >= self.max_delay:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self.store.append_chunks(self.job_id, ["".join(self._pending)])
+            self._pending, self._pending_chars = [], 0
+        self._last_flush = time.monotonic()
+
+
+class ThreadDispatcher:
+    """Runs the worker in a background thread (local / in-memory mode)."""
+
+    def dispatch(self, job_id: str, worker: Callable[[str], None], context=None) -> None:
+        threading.Thread(target=worker, args=(job_id,), daemon=True).start()
+
+
+class LambdaSelfInvokeDispatcher:
+    """Starts the worker as an async (Event) invocation of this same function."""
+
+    def __init__(self):
+        self._client = None
+
+    def dispatch(self, job_id: str, worker: Callable[[str], None], context=None) -> None:
+        if self._client is None:
+            from aws_clients import get_client
+            self._client = get_client("lambda")
+        function_name = getattr(context, "invoked_function_arn", None) or os.environ["AWS_LAMBDA_FUNCTION_NAME"]
+        self._client.invoke(FunctionName=function_name, InvocationType="Event",
+                            Payload=json.dumps({"asyncJob": job_id}).encode("utf-8"))
+
+
+def async_jobs_supported() -> bool:
+    """
+    Inside Lambda, async jobs need the shared table: a thread worker is frozen as
+    soon as the 202 is returned, and polls can land on other containers.
+    """
+    return bool(os.getenv("ASYNC_JOB_TABLE")) or not os.getenv("AWS_LAMBDA_FUNCTION_NAME")
+
+
+def build_job_backend():
+    """(store, dispatcher) for the current environment."""
+    table = os.getenv("ASYNC_JOB_TABLE")
+    if table:
+        from aws_clients import lazy_client
+        return DynamoJobStore(lazy_client("dynamodb"), table), LambdaSelfInvokeDispatcher()
+    return InMemoryJobStore(), ThreadDispatcher()
+
+
+def wait_for_job(store, job_id: str, after: int = 0, wait: float = 0.0) -> Optional[dict]:
+    """Long-poll: returns as soon as the job has chunks past `after`, finishes, or `wait` elapses."""
+    deadline = time.monotonic() + min(max(wait, 0.0), MAX_LONG_POLL_SECONDS)
+    while True:
+        job = store.get(job_id)
+        if job is None or job["status"] in TERMINAL_STATUSES or len(job["chunks"]) > after:
+            return job
+        if time.monotonic() >= deadline:
+            return job
+        time.sleep(store.poll_interval)
@@ -1,24 +1,261 @@
 import json
-import boto3
+import time
 import base64
-from io import BytesIO
-from PyPDF2 import PdfReader
+from multipart import MemoryviewReader, MultipartError, iter_parts, parse_boundary
+from pdf_extract import extract_pdf_text
+from resume_text_cache import ResumeTextCache
+from session_store import build_agent_input, build_session_store, resolve_session_id, session_resume_key
+from response_cache import ResponseCache
+from fast_path import FastPathResponder
+from agent_limiter import AgentBusyError, AgentGate, PartialReplyError
+from completion_reader import CompletionReader
+from job_store import (ChunkBatcher, LambdaSelfInvokeDispatcher, async_jobs_supported, build_job_backend, new_job,
+                       wait_for_job)
+from job_prefetch import JobPrefetcher
+from idempotency import IdempotencyGuard, idempotency_key
+from aws_clients import get_client, lazy_client
+from priming import Primer, warm_aws_connection, warm_bedrock_agent_runtime, warm_dynamodb
 
-# Initialize Bedrock client globally for efficiency
-bedrock = boto3.client("bedrock-agent-runtime")
+# Bedrock client, created on first use (not on OPTIONS / fast-path / cached requests).
+# botocore retries are off: AgentGate owns retries (jittered, within a time budget).
+bedrock = lazy_client("bedrock-agent-runtime", retries={"mode": "standard", "total_max_attempts": 1})
+AGENT_ID = "JGTQXH9PYU"
+AGENT_ALIAS_ID = "WTUG4HEFOY"
 
+# Adaptive (AIMD) concurrency limit + retry policy around invoke_agent
+agent_gate = AgentGate()
+
+# Only this much resume text is forwarded to the agent, so stop parsing there
+RESUME_CHAR_BUDGET = 6000
+RESUME_TIME_BUDGET = 10.0  # seconds
+
+# Re-uploads of the same PDF skip parsing (keyed by SHA-256 of the file bytes)
+resume_cache = ResumeTextCache(namespace=f"v1-{RESUME_CHAR_BUDGET}")
+
+# Per-user/conversation agent sessions and the resume text they've been given
+session_store = build_session_store()
+
+# Near-identical questions are answered from cache instead of a full agent run
+response_cache = ResponseCache()
+
+# Quick-start buttons and small talk are answered locally
+fast_path = FastPathResponder()
+
+# Long agent runs can be submitted as jobs and polled (in-memory + thread locally,
+# DynamoDB + async self-invocation when ASYNC_JOB_TABLE is set)
+job_store, job_dispatcher = build_job_backend()
+
+# Likely job searches are started on the serpapi Lambda while the agent thinks
+job_prefetcher = JobPrefetcher()
+
+# Duplicate submissions (same Idempotency-Key) join or replay the original run
+idempotency = IdempotencyGuard()
+
+
+def _parse_pdf(file_bytes):
+    stream = MemoryviewReader(file_bytes) if isinstance(file_bytes, memoryview) else file_bytes
+    result = extract_pdf_text(stream, max_chars=RESUME_CHAR_BUDGET, time_budget=RESUME_TIME_BUDGET)
+    print(f"📄 PDF extraction: {json.dumps(result.summary())}")
+    if result.error:
+        return f"[PDF extraction failed: {result.error}]", False
+    return result.text, result.stop_reason != "time_budget"
+
+
+def extract_text_from_pdf(file_bytes) -> str:
+    """Extracts up to RESUME_CHAR_BUDGET chars from a PDF (bytes or memoryview) using PyPDF2 (Lambda layer provided)."""
+    return resume_cache.get_or_extract(file_bytes, _parse_pdf)
+
+
+# === Streaming (SSE / NDJSON) ===
+STREAM_CONTENT_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def get_stream_format(headers: dict, body: dict):
+    """Returns "sse" / "ndjson" when the client asked for a streamed reply, else None (buffered JSON)."""
+    accept = headers.get("accept", "")
+    for fmt, mime in STREAM_CONTENT_TYPES.items():
+        if mime in accept:
+            return fmt
+    requested = str(body.get("stream") or "").lower()
+    if requested in STREAM_CONTENT_TYPES:
+        return requested
+    if requested in ("true", "1"):
+        return "ndjson"
+    return None
+
+
+def encode_stream_event(fmt: str, payload: dict) -> str:
+    """Frames one event as an SSE message or an NDJSON line."""
+    data = json.dumps(payload)
+    if fmt == "sse":
+        return f"event: {payload['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+def stream_agent_reply(response, emit, started_at: float):
+    """
+    Passes {"type": "chunk"} events to `emit` as completion chunks arrive, then
+    a final "done" event carrying the full reply and latency metrics. The stream
+    handler encodes events as SSE/NDJSON frames; async jobs append them to the job.
+    Returns (reply, metrics).
+    """
+    reader = CompletionReader(response, started_at=started_at)
+    for text in reader:
+        emit({"type": "chunk", "text": text})
+
+    reply = reader.text().strip() or response.get("outputText") or ""
+    metrics = reader.metrics()
+    print(f"📈 Stream metrics: {metrics}")
+    emit({"type": "done", "reply": reply, "metrics": metrics})
+    return reply, metrics
+
+
+def stream_response(cors_headers: dict, fmt: str, frames: list) -> dict:
+    return {
+        "statusCode": 200,
+        "headers": {
+            **cors_headers,
+            "Content-Type": STREAM_CONTENT_TYPES[fmt],
+            "Cache-Control": "no-cache",
+        },
+        "body": "".join(frames),
+    }
+
+
+def build_reply_response(cors_headers: dict, reply: str, stream_format=None, source: str = "agent") -> dict:
+    """Answers without a live agent run (cache, fast path) in whichever format the client asked for."""
+    if stream_format:
+        return stream_response(cors_headers, stream_format, [
+            encode_stream_event(stream_format, {"type": "chunk", "text": reply}),
+            encode_stream_event(stream_format, {"type": "done", "reply": reply, "metrics": {"source": source}}),
+        ])
+    return {
+        "statusCode": 200,
+        "headers": cors_headers,
+        "body": json.dumps({"reply": reply}),
+    }
+
+
+def invoke_bedrock_agent(session_id: str, input_text: str, consume, stream: bool = False):
+    """
+    invoke_agent plus consume(response) under the adaptive limiter: invoke_agent
+    returns once the event stream opens, so the slot is held until the completion
+    has been read, and errors raised inside the stream (throttlingException) are
+    counted and retried like invoke errors. `consume` starts over on each attempt;
+    `stream` asks for the final answer in chunks. Returns what `consume` returns.
+    """
+    invoke_kwargs = {}
+    if stream:
+        # Without this the agent delivers its final answer as one chunk at the end
+        invoke_kwargs["streamingConfigurations"] = {"streamFinalResponse": True}
+    return agent_gate.call(lambda: consume(bedrock.invoke_agent(
+        agentId=AGENT_ID,
+        agentAliasId=AGENT_ALIAS_ID,
+        sessionId=session_id,
+        inputText=input_text,
+        **invoke_kwargs,
+    )))
+
+
+# === Async jobs (POST {"async": true} → 202 + jobId + sessionId; poll with both: GET ?jobId=&sessionId= or POST) ===
+def wants_async(headers: dict, body: dict) -> bool:
+    return "respond-async" in headers.get("prefer", "") or str(body.get("async") or "").lower() in ("true", "1")
+
+
+def submit_async_job(session_id: str, input_text: str, user_message: str, resume_key, context) -> dict:
+    job = new_job(session_id, input_text, user_message)
+    job["resume_key"] = resume_key
+    job_store.create(job)
+    job_dispatcher.dispatch(job["job_id"], run_async_job, context)
+    print(f"🧵 Async job {job['job_id']} queued [session {session_id}]")
+    return job
+
+
+def run_async_job(job_id: str) -> None:
+    """Worker: runs the agent for a queued job, appending reply chunks as they arrive."""
+    job = job_store.get(job_id)
+    if job is None or job["status"] != "pending":
+        # Async invocations can be redelivered; only the first delivery runs the agent
+        print(f"⚠️ Async job {job_id} not pending ({job and job['status']}); skipping")
+        return
+
+    job_store.update(job_id, status="running")
+    batcher = ChunkBatcher(job_store, job_id)
+    emitted = {"chunks": 0}
+
+    def emit(event_payload):
+        if event_payload["type"] == "chunk":
+            emitted["chunks"] += 1
+            batcher.add(event_payload["text"])
+
+    def consume(response):
+        try:
+            return stream_agent_reply(response, emit, time.time())
+        except Exception as stream_error:
+            if emitted["chunks"]:
+                # Chunks already reached the job; a retry would repeat them
+                raise PartialReplyError(f"Agent stream failed mid-reply: {stream_error}") from stream_error
+            raise
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extracts text from a PDF file using PyPDF2 (Lambda layer provided)."""
-    text = ""
     try:
-        reader = PdfReader(BytesIO(file_bytes))
-        for page in reader.pages:
-            if page_text := page.extract_text():
-                text += page_text + "\n"
-    except Exception as e:
-        text = f"[PDF extraction failed: {e}]"
-    return text.strip()
+        job_prefetcher.maybe_prefetch(job["session_id"], job["message"])
+        reply, metrics = invoke_bedrock_agent(job["session_id"], job["input"], consume, stream=True)
+        batcher.flush()
+        job_store.update(job_id, status="done", reply=reply, metrics=metrics)
+        response_cache.put(job["message"], reply, job.get("resume_key"))
+        print(f"✅ Async job {job_id} done ({len(reply)} chars)")
+    except Exception as job_error:
+        print(f"❌ Async job {job_id} failed:", job_error)
+        batcher.flush()
+        job_store.update(job_id, status="failed", error=str(job_error))
+
+
+def poll_job_response(cors_headers: dict, params: dict, session_id: str) -> dict:
+    """
+    New chunks after cursor `after`, plus the reply once the job is done. `wait`
+    long-polls (seconds). Only the session that submitted the job can poll it.
+    """
+    try:
+        after = max(0, int(params.get("after") or 0))
+        wait = float(params.get("wait") or 0)
+    except (TypeError, ValueError):
+        return {
+            "statusCode": 400,
+            "headers": cors_headers,
+            "body": json.dumps({"error": "after/wait must be numbers."}),
+        }
+
+    job_id = str(params["jobId"])
+    job = job_store.get(job_id)
+    if job is not None and job.get("session_id") == session_id:
+        job = wait_for_job(job_store, job_id, after, wait)
+    else:
+        job = None
+    if job is None:
+        return {
+            "statusCode": 404,
+            "headers": cors_headers,
+            "body": json.dumps({"error": "Unknown or expired job."}),
+        }
+
+    payload = {
+        "jobId": job["job_id"],
+        "status": job["status"],
+        "chunks": job["chunks"][after:],
+        "next": len(job["chunks"]),
+    }
+    if job["status"] == "done":
+        payload.update(reply=job["reply"], metrics=job["metrics"])
+    elif job["status"] == "failed":
+        payload["error"] = job["error"]
+    return {
+        "statusCode": 200,
+        "headers": cors_headers,
+        "body": json.dumps(payload),
+    }
 
 
 def get_cors_headers(event):
@@ -34,21 +271,127 @@ def get_cors_headers(event):
 
     return {
         "Access-Control-Allow-Origin": allow_origin,
-        "Access-Control-Allow-Headers": "Content-Type",
-        "Access-Control-Allow-Methods": "POST,OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type,X-Session-Id,Prefer,Idempotency-Key",
+        "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
         "Access-Control-Allow-Credentials": "true",
         "Content-Type": "application/json",
     }
 
 
+def run_agent_turn(context, cors_headers: dict, headers: dict, body: dict, session_id: str,
+                   user_message: str, pdf_text: str, stream_format) -> dict:
+    """Builds the agent input and answers with a live agent run (or an async job id)."""
+    # Combine message + resume context (full resume only the first time this agent session sees it)
+    combined_input = build_agent_input(session_store, session_id, user_message, pdf_text[:RESUME_CHAR_BUDGET])
+    resume_key = session_resume_key(session_store, session_id)
+
+    print(f"🧠 Sending to Claude [session {session_id}] (first 200 chars): {combined_input[:200]}")
+
+    # === Async mode: answer with a job id, the worker runs the agent ===
+    if wants_async(headers, body):
+        if async_jobs_supported():
+            job = submit_async_job(session_id, combined_input, user_message, resume_key, context)
+            return {
+                "statusCode": 202,
+                "headers": cors_headers,
+                # Polls must carry this sessionId (the conversation part of the agent session)
+                "body": json.dumps({"jobId": job["job_id"], "status": job["status"], "next": 0,
+                                    "sessionId": session_id.split(".", 1)[1]}),
+            }
+        print("⚠️ Async mode requested but ASYNC_JOB_TABLE isn't set; answering synchronously")
+
+    # === Bedrock Agent Invocation ===
+    job_prefetcher.maybe_prefetch(session_id, user_message)
+    invoke_started = time.time()
+    frames = []
+
+    def consume(response):
+        """Reads the whole completion; returns (reply, cacheable). Runs again from scratch on a retry."""
+        # === Streamed Response (SSE / NDJSON): frames are only sent once the run completes ===
+        if stream_format:
+            frames.clear()
+            reply, _ = stream_agent_reply(
+                response, lambda event_payload: frames.append(encode_stream_event(stream_format, event_payload)),
+                invoke_started,
+            )
+            return reply, True
+
+        # === Parse Response (buffered JSON fallback) ===
+        reader = CompletionReader(response, started_at=invoke_started)
+        output_text = reader.read()
+        print(f"📈 Completion metrics: {reader.metrics()}")
+        if output_text.strip():
+            return output_text, True
+        if "outputText" in response:
+            return response["outputText"], False
+        if "sessionState" in response and "returnText" in response["sessionState"]:
+            return response["sessionState"]["returnText"], False
+        return json.dumps(response, indent=2)[:6000], False
+
+    try:
+        output_text, cacheable = invoke_bedrock_agent(session_id, combined_input, consume,
+                                                      stream=bool(stream_format))
+    except AgentBusyError as busy:
+        print("🚦 Bedrock busy:", busy, agent_gate.limiter.snapshot())
+        return {
+            "statusCode": 503,
+            "headers": {**cors_headers, "Retry-After": str(max(1, round(busy.retry_after)))},
+            "body": json.dumps({"error": str(busy), "limiter": agent_gate.limiter.snapshot()}),
+        }
+    except Exception as invoke_error:
+        print("❌ Bedrock invocation failed:", invoke_error)
+        return {
+            "statusCode": 502,
+            "headers": cors_headers,
+            "body": json.dumps({"error": f"Bedrock invocation failed: {str(invoke_error)}"}),
+        }
+
+    if cacheable:
+        response_cache.put(user_message, output_text.strip(), resume_key)
+    if stream_format:
+        return stream_response(cors_headers, stream_format, frames)
+
+    print("✅ Response length:", len(output_text), "limiter:", agent_gate.limiter.snapshot())
+
+    # === Success Response ===
+    return {
+        "statusCode": 200,
+        "headers": cors_headers,
+        "body": json.dumps({"reply": output_text.strip()}),
+    }
+
+
+def replay_response(cors_headers: dict, original: dict) -> dict:
+    """Response for a duplicate request: the original's stored response, or 409 while it still runs."""
+    if original["status"] != "done":
+        return {
+            "statusCode": 409,
+            "headers": {**cors_headers, "Retry-After": "2"},
+            "body": json.dumps({"error": "A request with this idempotency key is still being processed."}),
+        }
+    stored = original["response"]
+    return {
+        "statusCode": stored["statusCode"],
+        "headers": {**cors_headers, "Content-Type": stored.get("contentType") or "application/json",
+                    "Idempotent-Replayed": "true"},
+        "body": stored["body"],
+    }
+
+
 def lambda_handler(event, context):
     try:
         print("Incoming event keys:", list(event.keys()))
 
+        # === Async job worker (self-invocation with InvocationType="Event") ===
+        if "asyncJob" in event:
+            run_async_job(event["asyncJob"])
+            return {"jobId": event["asyncJob"]}
+
         cors_headers = get_cors_headers(event)
+        method = event.get("requestContext", {}).get("http", {}).get("method") or event.get("httpMethod")
 
         # === Handle CORS preflight ===
-        if event.get("requestContext", {}).get("http", {}).get("method") == "OPTIONS":
+        if method == "OPTIONS":
             return {
                 "statusCode": 200,
                 "headers": cors_headers,
@@ -57,29 +400,44 @@ def lambda_handler(event, context):
 
         user_message = ""
         pdf_text = ""
+        body = {}
 
         # Normalize headers
         headers = {k.lower(): v for k, v in event.get("headers", {}).items()} if event.get("headers") else {}
         content_type = headers.get("content-type", "")
 
+        # === Poll an async job ===
+        query = event.get("queryStringParameters") or {}
+        if method == "GET" and query.get("jobId"):
+            return poll_job_response(cors_headers, query, resolve_session_id(event, headers, query))
+
         # === CASE 1: JSON input (regular chat) ===
         if "application/json" in content_type:
             body = json.loads(event.get("body", "{}") or "{}")
+            if body.get("jobId"):
+                return poll_job_response(cors_headers, body, resolve_session_id(event, headers, body))
             user_message = body.get("message", "").strip()
 
         # === CASE 2: Multipart form-data (PDF upload + message) ===
         elif "multipart/form-data" in content_type:
-            boundary = content_type.split("boundary=")[-1]
             body_bytes = base64.b64decode(event["body"]) if event.get("isBase64Encoded") else event["body"].encode()
 
-            for part in body_bytes.split(f"--{boundary}".encode()):
-                if b'name="message"' in part:
-                    start = part.find(b"\r\n\r\n") + 4
-                    user_message = part[start:].strip().decode("utf-8", errors="ignore")
-                elif b'name="file"' in part:
-                    start = part.find(b"\r\n\r\n") + 4
-                    file_bytes = part[start:].strip()
-                    pdf_text = extract_text_from_pdf(file_bytes)
+            # Parts are memoryview slices of body_bytes; the file goes to PyPDF2 without a copy
+            try:
+                for part in iter_parts(body_bytes, parse_boundary(content_type)):
+                    if part.name == "message":
+                        user_message = part.text()
+                    elif part.name == "file":
+                        pdf_text = extract_text_from_pdf(part.data)
+                    elif part.name in ("sessionId", "conversationId", "async", "idempotencyKey"):
+                        body[part.name] = part.text()
+            except MultipartError as multipart_error:
+                print(f"❌ Bad multipart body: {multipart_error}")
+                return {
+                    "statusCode": multipart_error.status_code,
+                    "headers": cors_headers,
+                    "body": json.dumps({"error": str(multipart_error)}),
+                }
 
         else:
             print(f"❌ Unsupported content type: {content_type}")
@@ -89,60 +447,52 @@ def lambda_handler(event, context):
                 "body": json.dumps({"error": "Unsupported content type."}),
             }
 
-        # Combine message + resume context
-        combined_input = user_message
-        if pdf_text:
-            combined_input += "\n\nHere is the text extracted from the attached resume:\n" + pdf_text[:6000]
-
-        if not combined_input.strip():
+        if not user_message.strip() and not pdf_text:
             return {
                 "statusCode": 400,
                 "headers": cors_headers,
                 "body": json.dumps({"error": "Empty input."}),
             }
 
-        print(f"🧠 Sending to Claude (first 200 chars): {combined_input[:200]}")
-
-        # === Bedrock Agent Invocation ===
-        try:
-            response = bedrock.invoke_agent(
-                agentId="JGTQXH9PYU",
-                agentAliasId="WTUG4HEFOY",
-                sessionId="frontend-session",
-                inputText=combined_input,
-            )
-        except Exception as invoke_error:
-            print("❌ Bedrock invocation failed:", invoke_error)
-            return {
-                "statusCode": 502,
-                "headers": cors_headers,
-                "body": json.dumps({"error": f"Bedrock invocation failed: {str(invoke_error)}"}),
-            }
-
-        # === Parse Response ===
-        output_text = ""
+        body = body if isinstance(body, dict) else {}
+        session_id = resolve_session_id(event, headers, body)
+        stream_format = get_stream_format(headers, body)
 
-        if "completion" in response:
-            for event_piece in response.get("completion", []):
-                if "chunk" in event_piece and "bytes" in event_piece["chunk"]:
-                    output_text += event_piece["chunk"]["bytes"].decode("utf-8", errors="ignore")
+        # === Fast path + response cache (skipped when a resume is attached: the agent must see it) ===
+        if not pdf_text:
+            fast_reply = fast_path.respond(user_message)
+            if fast_reply is not None:
+                return build_reply_response(cors_headers, fast_reply, stream_format, source="fast_path")
 
-        if not output_text.strip():
-            if "outputText" in response:
-                output_text = response["outputText"]
-            elif "sessionState" in response and "returnText" in response["sessionState"]:
-                output_text = response["sessionState"]["returnText"]
-            else:
-                output_text = json.dumps(response, indent=2)[:6000]
+            cached_reply = response_cache.get(user_message, session_resume_key(session_store, session_id))
+            if cached_reply is not None:
+                return build_reply_response(cors_headers, cached_reply, stream_format, source="cache")
 
-        print("✅ Response length:", len(output_text))
+        # === Idempotency: retries / double-clicks with the same key share one agent run ===
+        idem_key = idempotency_key(headers, body, session_id)
+        if idem_key is None:
+            return run_agent_turn(context, cors_headers, headers, body, session_id, user_message, pdf_text,
+                                  stream_format)
 
-        # === Success Response ===
-        return {
-            "statusCode": 200,
-            "headers": cors_headers,
-            "body": json.dumps({"reply": output_text.strip()}),
-        }
+        original = idempotency.begin(idem_key)
+        if original is not None:
+            return replay_response(cors_headers, original)
+        try:
+            result = run_agent_turn(context, cors_headers, headers, body, session_id, user_message, pdf_text,
+                                    stream_format)
+        except Exception:
+            idempotency.release(idem_key)
+            raise
+        if result["statusCode"] < 500:
+            idempotency.complete(idem_key, {
+                "statusCode": result["statusCode"],
+                "contentType": result["headers"].get("Content-Type"),
+                "body": result["body"],
+            })
+        else:
+            # Failed runs aren't replayed; the client's retry gets a fresh attempt
+            idempotency.release(idem_key)
+        return result
 
     except Exception as e:
         print("❌ Unhandled Exception:", str(e))
@@ -151,3 +501,42 @@ def lambda_handler(event, context):
             "headers": get_cors_headers(event),
             "body": json.dumps({"error": str(e)}),
         }
+
+
+# === INIT priming (see priming.py) ===
+# Connections and clients the first request would otherwise set up. PyPDF2 stays
+# lazy: most requests carry no PDF.
+primer = Primer()
+
+
+@primer.step("bedrock-agent-runtime")
+def _prime_bedrock():
+    return warm_bedrock_agent_runtime(bedrock, AGENT_ID, AGENT_ALIAS_ID)
+
+
+@primer.step("dynamodb")
+def _prime_dynamodb():
+    stores = (session_store, idempotency.store, job_store, resume_cache.store)
+    tables = [store for store in stores if getattr(store, "table_name", None)]
+    if not tables:
+        return "no tables configured"
+    # All stores share one client, so one request opens the pooled connection
+    return warm_dynamodb(tables[0].dynamo, tables[0].table_name)
+
+
+@primer.step("resume cache bucket")
+def _prime_s3():
+    store = resume_cache.store
+    if not getattr(store, "bucket", None):
+        return "not configured"
+    return warm_aws_connection(lambda: store.s3.head_bucket(Bucket=store.bucket))
+
+
+@primer.step("lambda")
+def _prime_lambda():
+    if not job_prefetcher.enabled and not isinstance(job_dispatcher, LambdaSelfInvokeDispatcher):
+        return "not used"
+    return warm_aws_connection(get_client("lambda").get_account_settings)
+
+
+primer.run()
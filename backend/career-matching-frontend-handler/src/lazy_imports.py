@@ -0,0 +1,65 @@
+import importlib
+import os
+import sys
+import threading
+import time
+from typing import Dict
+
+# === Lazy imports ===
+# lazy_import("PyPDF2") returns a stand-in that imports the module on first
+# attribute access, so heavy dependencies load on the code paths that use them
+# instead of during INIT (OPTIONS preflights, cached and fast-path replies never
+# pay for them). LAZY_IMPORTS=0 imports eagerly; tools/cold_start_profiler.py
+# runs each handler both ways to report the savings. Each Lambda deploys its
+# own copy of this module.
+
+LAZY_IMPORTS = os.getenv("LAZY_IMPORTS", "1") != "0"
+
+_lock = threading.Lock()
+import_timings_ms: Dict[str, float] = {}
+
+
+class LazyModule:
+    """Module stand-in; the real module is imported on first attribute access."""
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is not None:
+            return module
+        with _lock:
+            module = self.__dict__["_module"]
+            if module is None:
+                name = self.__dict__["_name"]
+                already_loaded = name in sys.modules
+                started = time.perf_counter()
+                module = importlib.import_module(name)
+                if not already_loaded:
+                    import_timings_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+                    print(f"📦 Lazy-imported {name} in {import_timings_ms[name]} ms")
+                self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_import(name: str):
+    """The module itself when LAZY_IMPORTS=0, otherwise a LazyModule for it."""
+    if not LAZY_IMPORTS:
+        return importlib.import_module(name)
+    return LazyModule(name)
+
+
+def import_stats() -> dict:
+    return {"lazy": LAZY_IMPORTS, "loaded_ms": dict(import_timings_ms)}
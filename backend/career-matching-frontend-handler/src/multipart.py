@@ -0,0 +1,160 @@
+import io
+import re
+from typing import Dict, Iterator, Optional, Union
+
+# === Limits ===
+MAX_TOTAL_BYTES = 6 * 1024 * 1024        # Lambda's synchronous payload cap
+MAX_FILE_PART_BYTES = 5 * 1024 * 1024    # matches the 5MB check in the UI
+MAX_FIELD_PART_BYTES = 64 * 1024         # plain form fields (message, ...)
+MAX_HEADER_BYTES = 8 * 1024
+
+_BOUNDARY_RE = re.compile(r'boundary=(?:"([^"]+)"|([^;\s]+))', re.IGNORECASE)
+_DISPOSITION_PARAM_RE = re.compile(r'(\w+)="([^"]*)"|(\w+)=([^;\s]+)')
+
+
+class MultipartError(ValueError):
+    """Malformed multipart body. `status_code` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class Part:
+    """One form-data part. `data` is a memoryview into the request body (no copy)."""
+
+    __slots__ = ("headers", "name", "filename", "content_type", "data")
+
+    def __init__(self, headers: Dict[str, str], data: memoryview):
+        self.headers = headers
+        self.data = data
+        self.content_type = headers.get("content-type", "text/plain")
+        params = parse_disposition(headers.get("content-disposition", ""))
+        self.name = params.get("name")
+        self.filename = params.get("filename")
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return bytes(self.data).decode(encoding, errors="ignore").strip()
+
+
+def parse_boundary(content_type: str) -> bytes:
+    """Extracts the boundary from a multipart Content-Type header (quoted or bare)."""
+    m = _BOUNDARY_RE.search(content_type or "")
+    if not m:
+        raise MultipartError("Missing multipart boundary.")
+    return (m.group(1) or m.group(2)).encode("latin-1")
+
+
+def parse_disposition(value: str) -> Dict[str, str]:
+    params = {}
+    for m in _DISPOSITION_PARAM_RE.finditer(value):
+        key = (m.group(1) or m.group(3)).lower()
+        params[key] = m.group(2) if m.group(1) else m.group(4)
+    return params
+
+
+def _parse_headers(raw: memoryview) -> Dict[str, str]:
+    headers = {}
+    for line in bytes(raw).decode("utf-8", errors="replace").split("\r\n"):
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    return headers
+
+
+def iter_parts(
+    body: Union[bytes, bytearray, memoryview],
+    boundary: bytes,
+    max_total_bytes: int = MAX_TOTAL_BYTES,
+    part_limits: Optional[Dict[str, int]] = None,
+) -> Iterator[Part]:
+    """
+    Walks a multipart/form-data body part by part. Delimiters are located with
+    bytes.find on the original buffer and each part's payload is yielded as a
+    memoryview slice, so no part is copied. `part_limits` maps field name ->
+    max bytes (files default to MAX_FILE_PART_BYTES, fields to MAX_FIELD_PART_BYTES).
+    """
+    view = memoryview(body)
+    buf = view.obj if isinstance(view.obj, (bytes, bytearray)) and len(view) == len(view.obj) else bytes(view)
+    if len(buf) > max_total_bytes:
+        raise MultipartError(f"Request body exceeds {max_total_bytes} bytes.", status_code=413)
+
+    limits = part_limits or {}
+    dash_boundary = b"--" + boundary
+    delimiter = b"\r\n" + dash_boundary
+
+    pos = buf.find(dash_boundary)
+    if pos < 0:
+        raise MultipartError("Multipart boundary not found in body.")
+    pos += len(dash_boundary)
+
+    while True:
+        # After a boundary: "--" closes the body, otherwise CRLF starts a part
+        if buf[pos:pos + 2] == b"--":
+            return
+        line_end = buf.find(b"\r\n", pos)
+        if line_end < 0:
+            raise MultipartError("Truncated multipart body.")
+        header_start = line_end + 2
+
+        header_end = buf.find(b"\r\n\r\n", header_start, header_start + MAX_HEADER_BYTES)
+        if header_end < 0:
+            raise MultipartError("Multipart part headers missing or too large.")
+        headers = _parse_headers(view[header_start:header_end])
+
+        data_start = header_end + 4
+        data_end = buf.find(delimiter, data_start)
+        if data_end < 0:
+            raise MultipartError("Multipart closing boundary not found.")
+
+        part = Part(headers, view[data_start:data_end])
+        default_limit = MAX_FILE_PART_BYTES if part.filename is not None else MAX_FIELD_PART_BYTES
+        limit = limits.get(part.name or "", default_limit)
+        if len(part.data) > limit:
+            raise MultipartError(f"Part '{part.name}' exceeds {limit} bytes.", status_code=413)
+
+        yield part
+        pos = data_end + len(delimiter)
+
+
+class MemoryviewReader(io.RawIOBase):
+    """Seekable read-only stream over a memoryview, so parsers like PdfReader don't need a bytes copy."""
+
+    def __init__(self, data: Union[bytes, memoryview]):
+        super().__init__()
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            new_pos = offset
+        elif whence == io.SEEK_CUR:
+            new_pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            new_pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._pos = max(0, new_pos)
+        return self._pos
+
+    def readinto(self, b) -> int:
+        chunk = self._view[self._pos:self._pos + len(b)]
+        n = len(chunk)
+        b[:n] = chunk
+        self._pos += n
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return chunk
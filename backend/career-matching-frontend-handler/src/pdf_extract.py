@@ -0,0 +1,85 @@
+import time
+from io import BytesIO
+from typing import List, Optional
+from lazy_imports import lazy_import
+
+# Imported on the first PDF, not during INIT
+PyPDF2 = lazy_import("PyPDF2")
+
+
+class PdfExtraction:
+    """Result of a budgeted extraction: text plus what was read and how long each page took."""
+
+    def __init__(self):
+        self.text = ""
+        self.pages_total = 0
+        self.pages_read = 0
+        self.truncated = False
+        self.stop_reason: Optional[str] = None
+        self.page_timings_ms: List[float] = []
+        self.error: Optional[str] = None
+        self.total_ms = 0.0
+
+    def summary(self) -> dict:
+        return {
+            "chars": len(self.text),
+            "pages_read": self.pages_read,
+            "pages_total": self.pages_total,
+            "truncated": self.truncated,
+            "stop_reason": self.stop_reason,
+            "total_ms": self.total_ms,
+            "page_timings_ms": self.page_timings_ms,
+            "error": self.error,
+        }
+
+
+def extract_pdf_text(
+    source,
+    max_chars: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    separator: str = "\n",
+) -> PdfExtraction:
+    """
+    Extracts text page by page and stops as soon as the character, page or
+    time budget is met, so long or scanned PDFs don't parse pages nobody reads.
+    `source` is PDF bytes or a seekable binary stream.
+    """
+    result = PdfExtraction()
+    started = time.perf_counter()
+    parts: List[str] = []
+    chars = 0
+    try:
+        stream = BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        reader = PyPDF2.PdfReader(stream)
+        result.pages_total = len(reader.pages)
+
+        for index, page in enumerate(reader.pages):
+            if max_pages is not None and index >= max_pages:
+                result.stop_reason = "max_pages"
+                break
+            if time_budget is not None and time.perf_counter() - started >= time_budget:
+                result.stop_reason = "time_budget"
+                break
+
+            page_started = time.perf_counter()
+            page_text = page.extract_text() or ""
+            result.page_timings_ms.append(round((time.perf_counter() - page_started) * 1000, 1))
+            result.pages_read += 1
+
+            if page_text:
+                parts.append(page_text)
+                chars += len(page_text) + len(separator)
+            if max_chars is not None and chars >= max_chars:
+                result.stop_reason = "max_chars"
+                break
+    except Exception as e:
+        result.error = str(e)
+
+    text = separator.join(parts).strip()
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars]
+    result.text = text
+    result.truncated = result.pages_read < result.pages_total or (max_chars is not None and chars > max_chars)
+    result.total_ms = round((time.perf_counter() - started) * 1000, 1)
+    return result
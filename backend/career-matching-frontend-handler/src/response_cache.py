@@ -0,0 +1,157 @@
+import math
+import os
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+
+# === Semantic response cache in front of the Bedrock agent ===
+# Exact lookups on the normalized message (+ resume hash), then cosine
+# similarity over hashed word / character-trigram vectors for near-duplicates
+# ("what courses should I take for AI" vs "What courses should I take for AI, please?").
+# A similar hit also needs the same content words: trigram similarity alone
+# can't tell "... for AI" from "... for ML", and this cache is shared by all
+# users. Only context-free questions are stored: anything about the asker ("my",
+# "me", "I'm a junior") or the conversation ("based on", "I told you") was
+# answered from one student's session and is never served to another. Bounded
+# LRU with TTL; hit-rate metrics are logged.
+
+SIMILARITY_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.88"))
+CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+HASH_DIMS = 1 << 18
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9+#\s]")
+_SPACE_RE = re.compile(r"\s+")
+# Messages that lean on earlier turns can't be answered from another conversation
+_FOLLOW_UP_RE = re.compile(
+    r"^(?:and|also|what about|how about|ok|okay|yes|no)\b|\b(?:it|that|those|these|them|this one|above|previous|again|else|more)\b"
+)
+# First-person details and references to what was said before; apostrophes are normalized to spaces
+_PERSONAL_RE = re.compile(
+    r"\b(?:me|my|mine|myself|we|us|our|ours|i m|i am|i ve|i have|i had|i was|i d|i ll|im|ive"
+    r"|i (?:told|said|mentioned|asked|shared|uploaded)|you (?:told|said|mentioned|suggested|recommended)"
+    r"|based on|given|according to|earlier|last time|so far)\b"
+)
+_MIN_WORDS = 3
+_STOPWORDS = frozenset(
+    "a an the i me my we our you your is are am be do does did can could should would will "
+    "what which who whom how when where why to for of in on at with about from by into and or "
+    "any some there please tell give get show".split()
+)
+
+
+def normalize_message(message: str) -> str:
+    text = _NON_WORD_RE.sub(" ", (message or "").lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def is_cacheable_message(normalized: str) -> bool:
+    """Only self-contained, impersonal questions are shared across conversations."""
+    return (len(normalized.split()) >= _MIN_WORDS and not _FOLLOW_UP_RE.search(normalized)
+            and not _PERSONAL_RE.search(normalized))
+
+
+def content_words(normalized: str) -> FrozenSet[str]:
+    """Words that carry the question's meaning; must match exactly for a similar hit."""
+    return frozenset(w for w in normalized.split() if w not in _STOPWORDS)
+
+
+def _bucket(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) & (HASH_DIMS - 1)
+
+
+def vectorize(normalized: str) -> Dict[int, float]:
+    """L2-normalized sparse vector of hashed word unigrams/bigrams + char trigrams."""
+    vec: Dict[int, float] = {}
+    words = normalized.split()
+    features = words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+    padded = f" {normalized} "
+    features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+    for feature in features:
+        i = _bucket(feature)
+        vec[i] = vec.get(i, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {i: v / norm for i, v in vec.items()}
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(i, 0.0) for i, v in a.items())
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: int = CACHE_TTL,
+                 threshold: float = SIMILARITY_THRESHOLD):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        # key -> (reply, stored_at, vector, resume_key, content words)
+        self._entries: "OrderedDict[str, Tuple[str, float, Dict[int, float], str, FrozenSet[str]]]" = OrderedDict()
+        self.metrics = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "skipped": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(normalized: str, resume_key: Optional[str]) -> str:
+        return f"{resume_key or '-'}|{normalized}"
+
+    def hit_rate(self) -> float:
+        hits = self.metrics["exact_hits"] + self.metrics["similar_hits"]
+        lookups = hits + self.metrics["misses"]
+        return round(hits / lookups, 3) if lookups else 0.0
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at > self.ttl
+
+    def get(self, message: str, resume_key: Optional[str] = None) -> Optional[str]:
+        normalized = normalize_message(message)
+        if not is_cacheable_message(normalized):
+            self.metrics["skipped"] += 1
+            return None
+
+        now = time.time()
+        key = self._key(normalized, resume_key)
+        entry = self._entries.get(key)
+        if entry and not self._expired(entry[1], now):
+            self._entries.move_to_end(key)
+            self.metrics["exact_hits"] += 1
+            self._log("exact hit")
+            return entry[0]
+
+        vec = vectorize(normalized)
+        words = content_words(normalized)
+        best_key, best_score = None, 0.0
+        for other_key, (_, stored_at, other_vec, other_resume, other_words) in list(self._entries.items()):
+            if self._expired(stored_at, now):
+                del self._entries[other_key]
+                continue
+            if other_resume != (resume_key or "-") or other_words != words:
+                continue
+            score = cosine(vec, other_vec)
+            if score > best_score:
+                best_key, best_score = other_key, score
+
+        if best_key is not None and best_score >= self.threshold:
+            self._entries.move_to_end(best_key)
+            self.metrics["similar_hits"] += 1
+            self._log(f"similar hit ({best_score:.2f})")
+            return self._entries[best_key][0]
+
+        self.metrics["misses"] += 1
+        return None
+
+    def put(self, message: str, reply: str, resume_key: Optional[str] = None) -> None:
+        normalized = normalize_message(message)
+        if not reply or not is_cacheable_message(normalized):
+            return
+        key = self._key(normalized, resume_key)
+        self._entries[key] = (reply, time.time(), vectorize(normalized), resume_key or "-",
+                              content_words(normalized))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def _log(self, what: str) -> None:
+        print(f"⚡ Response cache {what}; hit_rate={self.hit_rate()} metrics={self.metrics}")
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+# === Per-user agent sessions + server-side resume context ===
+# Each student/conversation gets its own Bedrock agent session. The extracted
+# resume lives here; the full text goes to the agent once per agent session,
+# later turns only carry a short reference.
+
+SESSION_TTL = 6 * 3600                                        # how long we keep a session record
+AGENT_IDLE_TTL = int(os.getenv("AGENT_IDLE_SESSION_TTL", "600"))  # Bedrock idleSessionTTLInSeconds
+RESUME_REFERENCE_CHARS = 300
+MIN_CLIENT_SESSION_ID_CHARS = 16  # anonymous session ids must be hard to guess / collide on
+
+_SESSION_ID_SAFE_RE = re.compile(r"[^0-9a-zA-Z._:-]")
+
+
+def _sanitize(value: str, max_len: int = 48) -> str:
+    return _SESSION_ID_SAFE_RE.sub("-", value.strip())[:max_len]
+
+
+def resolve_session_id(event: dict, headers: dict, body: dict) -> str:
+    """
+    Bedrock sessionId for this caller: "<user>.<conversation>".
+    The user is only ever the authorizer's verified `sub`; client-supplied user ids
+    are ignored. Anonymous callers are identified by their own random session id
+    (the UI sends one per conversation); without a usable one they get a fresh
+    server-generated session, never one shared with other callers.
+    """
+    claims = ((event.get("requestContext") or {}).get("authorizer") or {}).get("jwt", {}).get("claims", {})
+    conversation = str(headers.get("x-session-id") or body.get("sessionId") or body.get("conversationId") or "")
+    conversation = _sanitize(conversation)
+
+    if claims.get("sub"):
+        return f"{_sanitize(str(claims['sub']))}.{conversation or 'default'}"
+    if len(conversation) >= MIN_CLIENT_SESSION_ID_CHARS:
+        return f"anon.{conversation}"
+    return f"anon.{uuid.uuid4().hex}"
+
+
+class InMemorySessionStore:
+    """Local stand-in; per container, bounded."""
+
+    def __init__(self, max_sessions: int = 500):
+        self.max_sessions = max_sessions
+        self._records: "OrderedDict[str, dict]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[dict]:
+        record = self._records.get(session_id)
+        if record is None or time.time() - record.get("updated_at", 0) > SESSION_TTL:
+            self._records.pop(session_id, None)
+            return None
+        self._records.move_to_end(session_id)
+        return record
+
+    def put(self, session_id: str, record: dict) -> None:
+        self._records[session_id] = record
+        self._records.move_to_end(session_id)
+        while len(self._records) > self.max_sessions:
+            self._records.popitem(last=False)
+
+
+class DynamoSessionStore:
+    """Shared store (partition key `session_id`, JSON record in `data`, TTL attribute `expires_at`)."""
+
+    def __init__(self, dynamodb_client, table_name: str):
+        self.dynamo = dynamodb_client
+        self.table_name = table_name
+
+    def get(self, session_id: str) -> Optional[dict]:
+        try:
+            item = self.dynamo.get_item(TableName=self.table_name, Key={"session_id": {"S": session_id}}).get("Item")
+        except Exception as e:
+            print(f"⚠️ Session store read failed: {e}")
+            return None
+        return json.loads(item["data"]["S"]) if item else None
+
+    def put(self, session_id: str, record: dict) -> None:
+        try:
+            self.dynamo.put_item(TableName=self.table_name, Item={
+                "session_id": {"S": session_id},
+                "data": {"S": json.dumps(record)},
+                "expires_at": {"N": str(int(time.time() + SESSION_TTL))},
+            })
+        except Exception as e:
+            print(f"⚠️ Session store write failed: {e}")
+
+
+def build_session_store():
+    table = os.getenv("CHAT_SESSION_TABLE")
+    if table:
+        from aws_clients import lazy_client
+        return DynamoSessionStore(lazy_client("dynamodb"), table)
+    return InMemorySessionStore()
+
+
+def session_resume_key(store, session_id: str) -> Optional[str]:
+    """Hash of the resume on file for this session (part of response-cache keys)."""
+    record = store.get(session_id)
+    return record.get("resume_key") if record else None
+
+
+def resume_reference(resume_text: str, resume_key: str) -> str:
+    """Short pointer to a resume the agent has already seen in this session."""
+    preview = " ".join(resume_text.split())
+    if len(preview) > RESUME_REFERENCE_CHARS:
+        preview = preview[:RESUME_REFERENCE_CHARS].rsplit(" ", 1)[0] + "…"
+    return (f"[The student's resume (ref {resume_key[:12]}) was shared earlier in this conversation. "
+            f"Opening lines: {preview}]")
+
+
+def build_agent_input(store, session_id: str, user_message: str, pdf_text: str) -> str:
+    """
+    Combines the message with resume context and updates the session record.
+    Full resume text is sent when it is new to the agent session (first upload,
+    a different file, or the agent session idled out); otherwise a reference.
+    """
+    now = time.time()
+    record = store.get(session_id) or {"created_at": now, "turns": 0}
+    agent_session_fresh = now - record.get("updated_at", 0) > AGENT_IDLE_TTL
+
+    if pdf_text:
+        resume_key = hashlib.sha256(pdf_text.encode("utf-8")).hexdigest()
+        if resume_key != record.get("resume_key"):
+            record.update(resume_key=resume_key, resume_text=pdf_text, resume_sent=False)
+
+    combined_input = user_message
+    if record.get("resume_text"):
+        if not record.get("resume_sent") or agent_session_fresh:
+            combined_input += "\n\nHere is the text extracted from the attached resume:\n" + record["resume_text"]
+            record["resume_sent"] = True
+        elif pdf_text:
+            combined_input += "\n\n" + resume_reference(record["resume_text"], record["resume_key"])
+
+    record["turns"] = record.get("turns", 0) + 1
+    record["updated_at"] = now
+    store.put(session_id, record)
+    return combined_input
@@ -0,0 +1,80 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+# === Shared AWS client factory ===
+# Clients are created on first use (boto3 itself is imported then too), cached
+# per (service, region, config overrides) and built with consistent timeouts,
+# adaptive retries and a connection pool sized for in-handler concurrency.
+# Each Lambda deploys its own copy of this module.
+
+MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "10"))
+RETRY_MAX_ATTEMPTS = int(os.getenv("AWS_RETRY_MAX_ATTEMPTS", "3"))
+
+# (connect_timeout, read_timeout) in seconds
+SERVICE_TIMEOUTS: Dict[str, Tuple[int, int]] = {
+    "bedrock-agent-runtime": (10, 120),
+    "lambda": (5, 35),
+    "dynamodb": (2, 5),
+    "s3": (3, 10),
+    "secretsmanager": (2, 5),
+}
+DEFAULT_TIMEOUTS = (5, 30)
+
+_clients: Dict[tuple, object] = {}
+_lock = threading.Lock()
+creation_counts: Dict[str, int] = {}
+
+
+def client_config(service: str, **overrides):
+    """botocore Config for `service`; keyword overrides win (e.g. read_timeout, retries)."""
+    from botocore.config import Config
+
+    connect_timeout, read_timeout = SERVICE_TIMEOUTS.get(service, DEFAULT_TIMEOUTS)
+    base = Config(
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        retries={"mode": "adaptive", "max_attempts": RETRY_MAX_ATTEMPTS},
+        tcp_keepalive=True,
+    )
+    return base.merge(Config(**overrides)) if overrides else base
+
+
+def get_client(service: str, region: Optional[str] = None, **config_overrides):
+    """Cached boto3 client; created (and boto3 imported) only when a code path first needs it."""
+    region = region or os.getenv("AWS_REGION") or "us-east-1"
+    key = (service, region, repr(sorted(config_overrides.items())))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            import boto3
+
+            client = boto3.client(service, region_name=region, config=client_config(service, **config_overrides))
+            _clients[key] = client
+            creation_counts[service] = creation_counts.get(service, 0) + 1
+            print(f"🔌 Created {service} client ({region}); creations={creation_counts}")
+    return client
+
+
+class LazyClient:
+    """Stand-in for a module-level client; the real one is created on first attribute access."""
+
+    def __init__(self, service: str, region: Optional[str] = None, **config_overrides):
+        self._args = (service, region, config_overrides)
+
+    def __getattr__(self, name):
+        service, region, overrides = self._args
+        return getattr(get_client(service, region, **overrides), name)
+
+
+def lazy_client(service: str, region: Optional[str] = None, **config_overrides) -> LazyClient:
+    return LazyClient(service, region, **config_overrides)
+
+
+def client_stats() -> dict:
+    return {"clients": len(_clients), "creations": dict(creation_counts)}
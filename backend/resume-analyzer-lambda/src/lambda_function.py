@@ -1,33 +1,43 @@
 import json
-import boto3
 import uuid
 import base64
-import io
-from PyPDF2 import PdfReader
-
-# AWS Clients
-s3 = boto3.client("s3")
-bedrock_agent = boto3.client("bedrock-agent-runtime")
+import pdf_extract
+from pdf_extract import extract_pdf_text
+from resume_text_cache import ResumeTextCache
+from aws_clients import lazy_client
+from priming import Primer, warm_aws_connection, warm_dynamodb
+
+# AWS Clients (created on first use: uploads need S3, lookups only Bedrock). The
+# function timeout is 3s, so each call gets one attempt that can't outlast it.
+CLIENT_LIMITS = {"connect_timeout": 1, "read_timeout": 2, "retries": {"mode": "standard", "total_max_attempts": 1}}
+s3 = lazy_client("s3", **CLIENT_LIMITS)
+bedrock_agent = lazy_client("bedrock-agent-runtime", **CLIENT_LIMITS)
 
 # === CONFIGURATION ===
 BUCKET_NAME = "jobmarket-agent-knowledge"     # S3 bucket
 KNOWLEDGE_BASE_ID = "LZYESBWUB7"              # Bedrock KB ID
 RESUME_DATASOURCE_ID = "DS67890XYZ"           # <-- Replace with the real Data Source ID for /resumes/
+RESUME_CHAR_BUDGET = 20000                    # plenty for a resume; stops runaway multi-page PDFs
+RESUME_TIME_BUDGET = 1.5                      # seconds; the function timeout is 3s
+
+# Re-uploads of the same PDF skip parsing (keyed by SHA-256 of the file bytes)
+resume_cache = ResumeTextCache(namespace=f"v1-{RESUME_CHAR_BUDGET}")
 
 
 # === PDF Extraction ===
+def _parse_pdf(file_bytes: bytes):
+    result = extract_pdf_text(
+        file_bytes, max_chars=RESUME_CHAR_BUDGET, time_budget=RESUME_TIME_BUDGET, separator=""
+    )
+    print(f"📄 PDF extraction: {json.dumps(result.summary())}")
+    if result.error:
+        return f"[PDF extraction failed: {result.error}]", False
+    return result.text, result.stop_reason != "time_budget"
+
+
 def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extracts text from a PDF file (bytes)."""
-    text = ""
-    try:
-        reader = PdfReader(io.BytesIO(file_bytes))
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text
-    except Exception as e:
-        text = f"[PDF extraction failed: {e}]"
-    return text.strip()
+    """Extracts text from a PDF file (bytes), within the character and time budget. Cached by content hash."""
+    return resume_cache.get_or_extract(file_bytes, _parse_pdf)
 
 
 # === Main Lambda Entry Point ===
@@ -166,3 +176,30 @@ def format_response(status_code: int, body: dict) -> dict:
             }
         }
     }
+
+
+# === INIT priming (see priming.py) ===
+# Uploads parse a PDF and write to S3 within a 3s timeout. Bedrock isn't primed:
+# this Lambda invokes no agent a warm-up lookup could target.
+primer = Primer()
+
+
+@primer.step("PyPDF2")
+def _prime_pypdf2():
+    pdf_extract.PyPDF2.PdfReader  # first attribute access imports it
+
+
+@primer.step("s3")
+def _prime_s3():
+    return warm_aws_connection(lambda: s3.head_bucket(Bucket=BUCKET_NAME))
+
+
+@primer.step("resume cache table")
+def _prime_resume_cache():
+    store = resume_cache.store
+    if not getattr(store, "table_name", None):
+        return "not configured"
+    return warm_dynamodb(store.dynamo, store.table_name)
+
+
+primer.run()
@@ -0,0 +1,151 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+# === Content-addressed cache of extracted resume text ===
+# Key = SHA-256 of the uploaded file bytes (+ a namespace for the extraction
+# budget), so re-uploading the same PDF skips PyPDF2 entirely.
+# Tiers: in-process LRU -> persistent store (/tmp by default; S3 or DynamoDB
+# when RESUME_CACHE_BUCKET / RESUME_CACHE_TABLE are set).
+
+DEFAULT_CACHE_DIR = "/tmp/resume-text-cache"
+
+
+def content_key(file_bytes, namespace: str = "") -> str:
+    """SHA-256 hex digest of the file (bytes or memoryview, hashed without copying)."""
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return f"{namespace}-{digest}" if namespace else digest
+
+
+class LocalDirStore:
+    """Persistent tier on the function's /tmp (survives warm invocations of the same container)."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"⚠️ Resume cache write failed: {e}")
+
+
+class S3Store:
+    """Shared tier in S3 (one object per key)."""
+
+    def __init__(self, s3_client, bucket: str, prefix: str = "resume-text-cache/"):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            obj = self.s3.get_object(Bucket=self.bucket, Key=f"{self.prefix}{key}.txt")
+            return obj["Body"].read().decode("utf-8")
+        except Exception:
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        try:
+            self.s3.put_object(Bucket=self.bucket, Key=f"{self.prefix}{key}.txt",
+                               Body=text.encode("utf-8"), ContentType="text/plain")
+        except Exception as e:
+            print(f"⚠️ Resume cache S3 write failed: {e}")
+
+
+class DynamoStore:
+    """Shared tier in DynamoDB (partition key `cache_key`, text in `resume_text`)."""
+
+    def __init__(self, dynamodb_client, table_name: str):
+        self.dynamo = dynamodb_client
+        self.table_name = table_name
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            item = self.dynamo.get_item(TableName=self.table_name, Key={"cache_key": {"S": key}}).get("Item")
+            return item["resume_text"]["S"] if item else None
+        except Exception:
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        try:
+            self.dynamo.put_item(TableName=self.table_name,
+                                 Item={"cache_key": {"S": key}, "resume_text": {"S": text}})
+        except Exception as e:
+            print(f"⚠️ Resume cache DynamoDB write failed: {e}")
+
+
+def build_persistent_store():
+    """Picks the persistent tier from the environment; /tmp is the local stand-in."""
+    bucket = os.getenv("RESUME_CACHE_BUCKET")
+    table = os.getenv("RESUME_CACHE_TABLE")
+    if bucket or table:
+        from aws_clients import lazy_client
+        if table:
+            return DynamoStore(lazy_client("dynamodb"), table)
+        return S3Store(lazy_client("s3"), bucket)
+    return LocalDirStore(os.getenv("RESUME_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+class ResumeTextCache:
+    def __init__(self, max_entries: int = 32, store=None, namespace: str = ""):
+        self.max_entries = max_entries
+        self.store = store if store is not None else build_persistent_store()
+        self.namespace = namespace
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"memory_hits": 0, "store_hits": 0, "misses": 0}
+
+    def _remember(self, key: str, text: str) -> None:
+        self._lru[key] = text
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return self._lru[key]
+        text = self.store.get(key) if self.store else None
+        if text is not None:
+            self.stats["store_hits"] += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        self._remember(key, text)
+        if self.store:
+            self.store.put(key, text)
+
+    def get_or_extract(self, file_bytes, extract: Callable[[object], Tuple[str, bool]]) -> str:
+        """
+        Returns cached text for these exact bytes, or runs `extract` once.
+        `extract` returns (text, cacheable); failed or time-cut extractions
+        should report cacheable=False so a later upload can retry them.
+        """
+        key = content_key(file_bytes, self.namespace)
+        text = self.get(key)
+        if text is not None:
+            print(f"♻️ Resume text cache hit ({key[:16]}…) stats={self.stats}")
+            return text
+
+        self.stats["misses"] += 1
+        text, cacheable = extract(file_bytes)
+        if cacheable:
+            self.put(key, text)
+        return text
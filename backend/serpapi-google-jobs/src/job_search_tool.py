@@ -1,7 +1,15 @@
 import os
 import json
-from typing import Optional, Dict, Any, List
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Dict, Any, List, Tuple
 from serpapi_client import SerpApiClient
+from job_summarizer import summarize_description
+from posted_date import RecencyIndex
+from result_facets import ResultSet, ResultSetStore, normalize_employment_type
+
+# Character budget for per-job snippets handed back to the Bedrock agent
+SNIPPET_BUDGET = 180
 
 # ---------------------------------------------------------
 # 🔁 Persistent SerpApiClient cache (survives warm invocations)
@@ -21,35 +29,161 @@ def _get_client(region: Optional[str] = None) -> SerpApiClient:
     return _cached_client
 
 
+# ---------------------------------------------------------
+# 🕒 Recency index over cached listings (answers "this week" locally)
+# ---------------------------------------------------------
+_recency_index = RecencyIndex(max_items=1000)
+_RECENCY_MAX_STALENESS = 15 * 60  # seconds a fetched query may answer recency refinements
+
+
+def _query_key(query: Optional[str], location: Optional[str]) -> str:
+    return f"{(query or '').strip().lower()}|{(location or '').strip().lower()}"
+
+
+def recent_jobs(query: str, location: Optional[str] = None, posted_within_days: float = 7) -> Optional[Dict[str, Any]]:
+    """
+    Answers a recency refinement from the local index.
+    Returns None when the query hasn't been fetched recently (caller should hit SerpAPI).
+    """
+    key = _query_key(query, location)
+    if not _recency_index.has_fresh(key, _RECENCY_MAX_STALENESS):
+        return None
+
+    jobs = _recency_index.within(posted_within_days * 86400, query_key=key)
+    print(f"🕒 Answered '{query}' (last {posted_within_days} day(s)) from recency index: {len(jobs)} job(s)")
+    return {
+        "query": query,
+        "location": location,
+        "count": len(jobs),
+        "next_page_token": None,
+        "jobs": jobs,
+        "cached": True,
+    }
+
+
+# ---------------------------------------------------------
+# 🧮 Last result set per session (answers facet refinements locally)
+# ---------------------------------------------------------
+_result_sets = ResultSetStore(max_sessions=200, ttl=1800)
+
+
+def _same_query(a: Optional[str], b: Optional[str]) -> bool:
+    """Same words, ignoring case and the "remote" SerpApiClient appends for location-less searches."""
+    def words(text):
+        return set((text or "").lower().split()) - {"remote"}
+    return words(a) == words(b)
+
+
+def refine_results(
+    session_id: str,
+    query: Optional[str] = None,
+    remote: Optional[bool] = None,
+    employment_type: Optional[str] = None,
+    company: Optional[str] = None,
+    exclude_companies: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Filters the session's last search results by facet without calling SerpAPI.
+    Returns None when the session has no cached results, or when `query` is given
+    and differs from every query those results were fetched for (a new search).
+    """
+    result_set = _result_sets.get(session_id) if session_id else None
+    if result_set is None:
+        return None
+    if query and not any(_same_query(query, fetched) for fetched in result_set.queries):
+        return None
+
+    jobs = result_set.refine(
+        remote=remote,
+        employment_type=normalize_employment_type(employment_type),
+        company=company,
+        exclude_companies=exclude_companies or (),
+    )
+    print(f"🧮 Refined {len(result_set.jobs)} cached job(s) to {len(jobs)} for session {session_id}")
+    return {
+        "query": result_set.query,
+        "location": result_set.location,
+        "count": len(jobs),
+        "next_page_token": None,
+        "jobs": jobs,
+        "cached": True,
+    }
+
+
+def apply_facets(
+    result: Dict[str, Any],
+    remote: Optional[bool] = None,
+    employment_type: Optional[str] = None,
+    company: Optional[str] = None,
+    exclude_companies: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Filters a fresh search result by facet (same semantics as refine_results)."""
+    jobs = ResultSet(result.get("jobs") or []).refine(
+        remote=remote,
+        employment_type=normalize_employment_type(employment_type),
+        company=company,
+        exclude_companies=exclude_companies or (),
+    )
+    return {**result, "count": len(jobs), "jobs": jobs}
+
+
+def _format_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": job.get("title"),
+        "company": job.get("company"),
+        "location": job.get("location"),
+        "posted_at": job.get("posted_at"),
+        "posted_ts": job.get("posted_ts"),
+        "snippet": summarize_description(job.get("snippet"), budget=SNIPPET_BUDGET) or None,
+        "link": job.get("link"),
+        "facets": job.get("facets"),
+    }
+
+
+def _fetch_and_index(client: SerpApiClient, query: str, location: Optional[str], limit: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Fetches one (query, location) from SerpAPI, formats the jobs and adds them to the recency index."""
+    data = client.search_google_jobs(query=query, location=location, limit=limit)
+    formatted_jobs = [_format_job(job) for job in data.get("results", [])]
+
+    # Index by posting time so later recency refinements stay local
+    key = _query_key(query, location)
+    for job in formatted_jobs:
+        _recency_index.add(job, query_key=key)
+    _recency_index.mark_fetched(key)
+    return data, formatted_jobs
+
+
 def search_jobs(
     query: str,
     location: Optional[str] = None,
     limit: int = 10,
     pages: int = 1,
-    region: Optional[str] = None
+    region: Optional[str] = None,
+    posted_within_days: Optional[float] = None,
+    session_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Queries SerpAPI for job listings and returns a clean, summarized structure.
     Uses a cached SerpApiClient for performance across warm invocations.
+    posted_within_days: only keep listings posted in the last N days; answered
+    from the recency index when this query was fetched recently.
+    session_id: when given, results are kept for facet refinements (see refine_results).
     """
-    client = _get_client(region)
+    if posted_within_days is not None:
+        cached = recent_jobs(query, location, posted_within_days)
+        if cached is not None:
+            return cached
 
-    # Fetch results
-    data = client.search_google_jobs(query=query, location=location, limit=limit)
-    jobs = data.get("results", [])
+    client = _get_client(region)
+    data, formatted_jobs = _fetch_and_index(client, query, location, limit)
     next_token = data.get("next_page_token")
 
-    # Format the jobs for readability
-    formatted_jobs: List[Dict[str, Any]] = []
-    for job in jobs:
-        formatted_jobs.append({
-            "title": job.get("title"),
-            "company": job.get("company"),
-            "location": job.get("location"),
-            "posted_at": job.get("posted_at"),
-            "snippet": (job.get("snippet") or "")[:180] + "…" if job.get("snippet") else None,
-            "link": job.get("link"),
-        })
+    if session_id:
+        _result_sets.put(session_id, ResultSet(formatted_jobs, query=data.get("query"), location=data.get("location")))
+
+    if posted_within_days is not None:
+        cutoff = time.time() - posted_within_days * 86400
+        formatted_jobs = [j for j in formatted_jobs if j["posted_ts"] is not None and j["posted_ts"] >= cutoff]
 
     # Build clean response
     summary = {
@@ -68,3 +202,86 @@ def search_jobs(
         print(f" - {j['title']} at {j['company']} ({j['location']})")
 
     return summary
+
+
+# ---------------------------------------------------------
+# 🌐 Concurrent fan-out over location / query variants
+# ---------------------------------------------------------
+FANOUT_MAX_WORKERS = 6
+FANOUT_DEADLINE_SECONDS = float(os.getenv("FANOUT_DEADLINE_SECONDS", "15"))
+
+
+def _dedupe_key(job: Dict[str, Any]) -> str:
+    if job.get("link"):
+        return job["link"]
+    return f"{(job.get('title') or '').lower()}|{(job.get('company') or '').lower()}|{(job.get('location') or '').lower()}"
+
+
+def search_jobs_fanout(
+    queries: List[str],
+    locations: List[Optional[str]],
+    limit: int = 10,
+    region: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+    session_id: Optional[str] = None,
+    posted_within_days: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Runs every (query, location) variant concurrently and returns one merged,
+    deduplicated, jointly ranked result within a shared deadline.
+    Variants that miss the deadline or fail are reported in `variants` and skipped.
+    Ranking is reciprocal-rank fusion across variants, newest first on ties.
+    posted_within_days / session_id: as in search_jobs; refinements naming any
+    one of the queries find the stored result set.
+    """
+    client = _get_client(region)
+    deadline = FANOUT_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+    variants = [(q, loc) for q in queries for loc in locations]
+
+    start = time.time()
+    pool = ThreadPoolExecutor(max_workers=min(FANOUT_MAX_WORKERS, len(variants)))
+    futures = {pool.submit(_fetch_and_index, client, q, loc, limit): (q, loc) for q, loc in variants}
+    done, _ = wait(futures, timeout=deadline)
+    # Don't hold the response for stragglers; they finish (and index) in the background
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+    variant_report: List[Dict[str, Any]] = []
+    for future, (q, loc) in futures.items():
+        report: Dict[str, Any] = {"query": q, "location": loc}
+        if future not in done:
+            report["error"] = "deadline exceeded"
+        elif future.exception() is not None:
+            report["error"] = str(future.exception())
+        else:
+            _, jobs = future.result()
+            report["count"] = len(jobs)
+            for rank, job in enumerate(jobs):
+                key = _dedupe_key(job)
+                merged.setdefault(key, job)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (rank + 1)
+        variant_report.append(report)
+
+    ranked = sorted(merged, key=lambda k: (scores[k], merged[k].get("posted_ts") or 0), reverse=True)
+    formatted_jobs = [merged[k] for k in ranked][:limit]
+
+    if session_id:
+        _result_sets.put(session_id, ResultSet(formatted_jobs, query=" | ".join(queries),
+                                               location=" | ".join(str(loc) for loc in locations),
+                                               queries=queries))
+
+    if posted_within_days is not None:
+        cutoff = time.time() - posted_within_days * 86400
+        formatted_jobs = [j for j in formatted_jobs if j["posted_ts"] is not None and j["posted_ts"] >= cutoff]
+
+    print(f"\n🌐 Fan-out over {len(variants)} variant(s) finished in {time.time() - start:.2f}s: "
+          f"{len(merged)} unique job(s), returning {len(formatted_jobs)}")
+    return {
+        "query": " | ".join(queries),
+        "location": " | ".join(str(loc) for loc in locations),
+        "count": len(formatted_jobs),
+        "next_page_token": None,
+        "jobs": formatted_jobs,
+        "variants": variant_report,
+    }
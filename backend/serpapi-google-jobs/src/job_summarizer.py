@@ -0,0 +1,142 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# ---------------------------------------------------------
+# 📝 Offline extractive summarizer for job descriptions
+# ---------------------------------------------------------
+# Picks the sentences that talk about requirements, pay and location
+# (plus the most "central" ones) until a character budget is filled, so the
+# agent gets the useful part of a posting instead of its first N characters.
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+|\s*\n+\s*|\s*[•·▪●◦]\s*")
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+# Topic cue patterns (matched at word starts) and the weight each topic adds
+_TOPIC_CUES: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "requirements": (3.0, (
+        "require", "qualification", "experience", "degree", "bachelor", "master",
+        "phd", "skill", "proficien", "knowledge of", "familiar", "must", "years",
+        "pursuing", "gpa", "graduat", "python", "java", "sql",
+    )),
+    "pay": (3.0, (
+        "salary", "pay", "compensation", "per hour", "an hour", "hourly",
+        "per year", "a year", "annual", "bonus", "equity", "stipend", "benefits",
+        "401k", "401(k)",
+    )),
+    "location": (2.0, (
+        "remote", "hybrid", "on-site", "onsite", "in-office", "in office",
+        "located", "relocat", "travel", "office",
+    )),
+}
+_TOPIC_RES = {
+    topic: (weight, re.compile(r"\b(?:" + "|".join(re.escape(c) for c in cues) + r")", re.IGNORECASE))
+    for topic, (weight, cues) in _TOPIC_CUES.items()
+}
+_MONEY_RE = re.compile(r"\$\s?\d")
+
+# Boilerplate that burns tokens without helping the student
+_BOILERPLATE_RE = re.compile(
+    r"\b(?:equal opportunity|eoe\b|without regard to|reasonable accommodation|"
+    r"privacy (?:notice|policy)|click apply|apply now)",
+    re.IGNORECASE,
+)
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "this to we will with you your who what which their they them us".split()
+)
+
+_MIN_SENTENCE_CHARS = 20
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a description into trimmed sentences / bullet items."""
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text or "") if s and s.strip()]
+
+
+def _truncate(text: str, budget: int) -> str:
+    if len(text) <= budget:
+        return text
+    cut = text[:max(budget - 1, 0)].rsplit(" ", 1)[0]
+    return cut + "…"
+
+
+def score_sentences(sentences: List[str]) -> List[Tuple[float, Optional[str]]]:
+    """
+    Returns (score, best_topic) per sentence.
+    Score = topic cue weights + centrality (avg document frequency of the
+    sentence's content words), minus penalties for boilerplate and fragments.
+    """
+    tokenized = [[w for w in _WORD_RE.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+
+    # Document-level term frequencies drive the centrality term
+    freq: Dict[str, int] = {}
+    for words in tokenized:
+        for w in set(words):
+            freq[w] = freq.get(w, 0) + 1
+    max_freq = max(freq.values()) if freq else 1
+
+    scored: List[Tuple[float, Optional[str]]] = []
+    for sentence, words in zip(sentences, tokenized):
+        centrality = (sum(freq[w] for w in words) / (len(words) * max_freq)) if words else 0.0
+        score = centrality
+
+        best_topic, best_weight = None, 0.0
+        for topic, (weight, cue_re) in _TOPIC_RES.items():
+            hit = bool(cue_re.search(sentence)) or (topic == "pay" and bool(_MONEY_RE.search(sentence)))
+            if hit:
+                score += weight
+                if weight > best_weight:
+                    best_topic, best_weight = topic, weight
+
+        if _BOILERPLATE_RE.search(sentence):
+            score -= 5.0
+        if len(sentence) < _MIN_SENTENCE_CHARS:
+            score -= 1.0
+        scored.append((score, best_topic))
+    return scored
+
+
+def summarize_description(text: Optional[str], budget: int = 800) -> str:
+    """
+    Extractive summary of a job description that fits in `budget` characters.
+    Short descriptions are returned unchanged; sentences are emitted in their
+    original order so the summary still reads naturally.
+    """
+    text = (text or "").strip()
+    if len(text) <= budget:
+        return text
+
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        return _truncate(text, budget)
+
+    scored = score_sentences(sentences)
+    order = sorted(range(len(sentences)), key=lambda i: scored[i][0], reverse=True)
+
+    chosen: List[int] = []
+    used = 0
+
+    def _try_add(i: int) -> bool:
+        nonlocal used
+        cost = len(sentences[i]) + (1 if chosen else 0)
+        if i in chosen or scored[i][0] <= 0 or used + cost > budget:
+            return False
+        chosen.append(i)
+        used += cost
+        return True
+
+    # 1) Best sentence for each topic first so requirements/pay/location are covered
+    for topic in _TOPIC_CUES:
+        for i in order:
+            if scored[i][1] == topic and _try_add(i):
+                break
+
+    # 2) Fill the remaining budget by score
+    for i in order:
+        _try_add(i)
+
+    if not chosen:
+        return _truncate(text, budget)
+
+    return " ".join(sentences[i] for i in sorted(chosen))
@@ -0,0 +1,137 @@
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# ---------------------------------------------------------
+# 🕒 "3 days ago" → absolute timestamps + recency index
+# ---------------------------------------------------------
+
+_UNIT_SECONDS = {
+    "minute": 60,
+    "min": 60,
+    "hour": 3600,
+    "hr": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+_RELATIVE_RE = re.compile(
+    r"\b(\d+|an?|one)\s*\+?\s*(minute|min|hour|hr|day|week|month|year)s?\s+ago\b",
+    re.IGNORECASE,
+)
+_ABSOLUTE_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_NOW_WORDS = ("just posted", "just now", "today")
+
+
+def parse_posted_at(value: Any, now: Optional[float] = None) -> Optional[float]:
+    """
+    Converts SerpAPI's free-text `posted_at` ("3 days ago", "30+ days ago",
+    "an hour ago", "yesterday", "2025-10-01") into a UTC epoch timestamp.
+    "30+ days ago" resolves to the lower bound (30 days). Returns None when
+    the value can't be interpreted.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    now = time.time() if now is None else now
+    text = value.strip().lower()
+
+    m = _RELATIVE_RE.search(text)
+    if m:
+        amount = m.group(1)
+        n = 1 if amount in ("a", "an", "one") else int(amount)
+        return now - n * _UNIT_SECONDS[m.group(2).lower()]
+
+    if "yesterday" in text:
+        return now - 86400
+    if any(w in text for w in _NOW_WORDS):
+        return now
+
+    m = _ABSOLUTE_RE.search(text)
+    if m:
+        try:
+            dt = datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)), tzinfo=timezone.utc)
+            return dt.timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class RecencyIndex:
+    """
+    Sorted (by posted timestamp) index over cached job listings so "only jobs
+    from this week" can be answered with a bisect instead of a new upstream
+    query. Bounded: the oldest listings are evicted first. Thread-safe: fan-out
+    workers index their results concurrently.
+    """
+
+    def __init__(self, max_items: int = 1000):
+        self.max_items = max_items
+        self._ts: List[float] = []                # ascending posted timestamps
+        self._entries: List[Tuple[str, Dict[str, Any]]] = []  # parallel to _ts: (query_key, job)
+        self._by_id: Dict[str, float] = {}       # "query_key|job_id" -> posted timestamp
+        self._fetched: Dict[str, float] = {}      # query_key -> last fetch time
+        self._lock = threading.Lock()              # keeps _ts and _entries in step
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    @staticmethod
+    def _entry_id(query_key: str, job: Dict[str, Any]) -> Optional[str]:
+        job_id = job.get("job_id") or job.get("link") or (
+            f"{job.get('title')}|{job.get('company')}|{job.get('location')}" if job.get("title") else None
+        )
+        return f"{query_key}|{job_id}" if job_id else None
+
+    def _remove(self, entry_id: str, ts: float) -> None:
+        lo, hi = bisect_left(self._ts, ts), bisect_right(self._ts, ts)
+        for i in range(lo, hi):
+            qk, job = self._entries[i]
+            if self._entry_id(qk, job) == entry_id:
+                del self._ts[i]
+                del self._entries[i]
+                break
+        self._by_id.pop(entry_id, None)
+
+    def add(self, job: Dict[str, Any], query_key: str = "") -> bool:
+        """Index a listing that carries `posted_ts`. Returns False if it has none."""
+        ts = job.get("posted_ts")
+        entry_id = self._entry_id(query_key, job)
+        if ts is None or entry_id is None:
+            return False
+        with self._lock:
+            if entry_id in self._by_id:
+                self._remove(entry_id, self._by_id[entry_id])
+
+            i = bisect_right(self._ts, ts)
+            self._ts.insert(i, ts)
+            self._entries.insert(i, (query_key, job))
+            self._by_id[entry_id] = ts
+
+            while len(self._ts) > self.max_items:
+                del self._ts[0]
+                qk, evicted = self._entries.pop(0)
+                self._by_id.pop(self._entry_id(qk, evicted), None)
+        return True
+
+    def mark_fetched(self, query_key: str, fetched_at: Optional[float] = None) -> None:
+        self._fetched[query_key] = time.time() if fetched_at is None else fetched_at
+
+    def has_fresh(self, query_key: str, max_staleness: float) -> bool:
+        fetched_at = self._fetched.get(query_key)
+        return fetched_at is not None and (time.time() - fetched_at) < max_staleness
+
+    def within(self, max_age_seconds: float, query_key: Optional[str] = None,
+               now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Listings posted in the last `max_age_seconds`, newest first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            start = bisect_left(self._ts, now - max_age_seconds)
+            entries = self._entries[start:]
+        return [
+            job for qk, job in reversed(entries)
+            if query_key is None or qk == query_key
+        ]
@@ -0,0 +1,154 @@
+import os
+import re
+import time
+import json
+from typing import Optional, Dict, Any, Set
+
+# ---------------------------------------------------------
+# 🔮 Speculative prefetch cache
+# The frontend handler guesses the job search a chat message will lead to and
+# async-invokes this Lambda with {"prefetch": true, ...} while the agent is
+# still thinking. The result is stored under the frontend session id; the
+# router's direct tool call carries that id as sessionId, and a job sub-agent's
+# action group call carries it as the originSessionId session attribute. A
+# similar query on either path is answered from here.
+# ---------------------------------------------------------
+
+PREFETCH_TTL = int(os.getenv("PREFETCH_TTL", "300"))
+PREFETCH_WAIT_SECONDS = float(os.getenv("PREFETCH_WAIT_SECONDS", "4"))
+QUERY_MATCH_THRESHOLD = 0.6
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_GENERIC_WORDS = {
+    "job", "jobs", "role", "roles", "position", "positions", "opening", "openings", "opportunity",
+    "opportunities", "listing", "listings", "current", "open", "available", "find", "me", "for", "in",
+    "near", "the", "a", "an", "some", "any", "of", "and", "or", "level",
+}
+_SYNONYMS = {"internship": "intern", "internships": "intern", "interns": "intern", "sr": "senior", "jr": "junior",
+             "engineering": "engineer", "developer": "engineer", "dev": "engineer", "swe": "software engineer"}
+
+
+def query_tokens(text: Optional[str]) -> Set[str]:
+    tokens = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        if word in _GENERIC_WORDS:
+            continue
+        word = _SYNONYMS.get(word, word)
+        for part in word.split():
+            tokens.add(part[:-1] if len(part) > 3 and part.endswith("s") else part)
+    return tokens
+
+
+def query_similarity(a: Optional[str], b: Optional[str]) -> float:
+    ta, tb = query_tokens(a), query_tokens(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def locations_compatible(a: Optional[str], b: Optional[str]) -> bool:
+    """"Dallas" matches "Dallas, TX"; two different cities don't, even in the same state."""
+    # Only the city part (before the first comma) is compared: "Dallas, Texas" and
+    # "Austin, Texas" share the state but are different searches
+    ta, tb = query_tokens((a or "").split(",")[0]), query_tokens((b or "").split(",")[0])
+    return not ta or not tb or ta == tb
+
+
+class InMemoryPrefetchStore:
+    """Per-container stand-in (hits only when the same warm container serves both calls)."""
+
+    def __init__(self, max_sessions: int = 200):
+        self.max_sessions = max_sessions
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(session_id)
+
+    def put(self, session_id: str, entry: Dict[str, Any]) -> None:
+        self._entries.pop(session_id, None)
+        self._entries[session_id] = entry
+        while len(self._entries) > self.max_sessions:
+            self._entries.pop(next(iter(self._entries)))
+
+
+class DynamoPrefetchStore:
+    """Shared store (partition key `session_id`, JSON entry in `data`, TTL attribute `expires_at`)."""
+
+    def __init__(self, dynamodb_client, table_name: str):
+        self.dynamo = dynamodb_client
+        self.table_name = table_name
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = self.dynamo.get_item(TableName=self.table_name, Key={"session_id": {"S": session_id}},
+                                        ConsistentRead=True).get("Item")
+        except Exception as e:
+            print(f"⚠️ Prefetch cache read failed: {e}")
+            return None
+        return json.loads(item["data"]["S"]) if item else None
+
+    def put(self, session_id: str, entry: Dict[str, Any]) -> None:
+        try:
+            self.dynamo.put_item(TableName=self.table_name, Item={
+                "session_id": {"S": session_id},
+                "data": {"S": json.dumps(entry)},
+                "expires_at": {"N": str(int(time.time() + PREFETCH_TTL))},
+            })
+        except Exception as e:
+            print(f"⚠️ Prefetch cache write failed: {e}")
+
+
+def build_prefetch_store():
+    table = os.getenv("PREFETCH_CACHE_TABLE")
+    if table:
+        from aws_clients import lazy_client
+        return DynamoPrefetchStore(lazy_client("dynamodb"), table)
+    return InMemoryPrefetchStore()
+
+
+class PrefetchCache:
+    def __init__(self, store=None, ttl: int = PREFETCH_TTL, wait_seconds: float = PREFETCH_WAIT_SECONDS):
+        self.store = store or build_prefetch_store()
+        self.ttl = ttl
+        self.wait_seconds = wait_seconds
+        self.metrics = {"hits": 0, "misses": 0, "mismatches": 0, "waited": 0}
+
+    def mark_pending(self, session_id: str, query: str, location: Optional[str]) -> None:
+        """Lets a search that arrives mid-prefetch wait for it instead of calling SerpAPI twice."""
+        self.store.put(session_id, {"status": "pending", "query": query, "location": location,
+                                    "stored_at": time.time()})
+
+    def put(self, session_id: str, query: str, location: Optional[str], result: Dict[str, Any]) -> None:
+        self.store.put(session_id, {"status": "ready", "query": query, "location": location,
+                                    "stored_at": time.time(), "result": result})
+
+    def fail(self, session_id: str, query: str, location: Optional[str]) -> None:
+        self.store.put(session_id, {"status": "failed", "query": query, "location": location,
+                                    "stored_at": time.time()})
+
+    def take(self, session_id: str, query: str, location: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Prefetched result for this session when its query/location match the agent's search."""
+        if not session_id:
+            return None
+        deadline = time.time() + self.wait_seconds
+        waited = False
+        while True:
+            entry = self.store.get(session_id)
+            if entry is None or time.time() - entry.get("stored_at", 0) > self.ttl:
+                self.metrics["misses"] += 1
+                return None
+            score = query_similarity(query, entry.get("query"))
+            if score < QUERY_MATCH_THRESHOLD or not locations_compatible(location, entry.get("location")):
+                self.metrics["mismatches"] += 1
+                print(f"🔮 Prefetch mismatch: '{entry.get('query')}' vs '{query}' ({score:.2f})")
+                return None
+            if entry["status"] == "ready":
+                self.metrics["hits"] += 1
+                self.metrics["waited"] += int(waited)
+                print(f"🔮 Prefetch hit for '{query}' (prefetched '{entry['query']}', {score:.2f}); metrics={self.metrics}")
+                return entry["result"]
+            if entry["status"] != "pending" or time.time() >= deadline:
+                self.metrics["misses"] += 1
+                return None
+            waited = True
+            time.sleep(0.2)
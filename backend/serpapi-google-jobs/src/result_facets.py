@@ -0,0 +1,139 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+# ---------------------------------------------------------
+# 🧮 Facets + per-session result sets with bitmap indexes
+# ---------------------------------------------------------
+# Follow-ups like "only remote ones", "just internships" or "exclude Amazon"
+# are answered by intersecting per-facet bitmaps (plain ints, one bit per job)
+# over the last results of the session, instead of a new SerpAPI query.
+
+# Whole-word cues, so "International" / "Internal" aren't internships
+_EMPLOYMENT_TYPES = (
+    ("internship", re.compile(r"\bintern(?:ship)?s?\b", re.IGNORECASE)),
+    ("part_time", re.compile(r"\bpart[- ]time\b", re.IGNORECASE)),
+    ("contract", re.compile(r"\b(?:contract|contractor|temporary|temp)\b", re.IGNORECASE)),
+    ("full_time", re.compile(r"\bfull[- ]time\b", re.IGNORECASE)),
+)
+
+
+def _normalize_employment_type(*texts: Optional[str]) -> Optional[str]:
+    blob = " ".join(t for t in texts if isinstance(t, str))
+    for kind, cue in _EMPLOYMENT_TYPES:
+        if cue.search(blob):
+            return kind
+    return None
+
+
+def extract_facets(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pulls refinement facets from a raw SerpAPI google_jobs item
+    (detected_extensions + extensions + title/location text).
+    """
+    detected = item.get("detected_extensions") if isinstance(item.get("detected_extensions"), dict) else {}
+    extensions = [e for e in (item.get("extensions") or []) if isinstance(e, str)] if isinstance(item.get("extensions"), list) else []
+    title = item.get("title") or item.get("job_title") or ""
+    location = item.get("location") or ""
+
+    schedule = detected.get("schedule_type") or next(
+        (e for e in extensions if _normalize_employment_type(e)), None
+    )
+    remote = bool(detected.get("work_from_home")) or any(
+        "remote" in t.lower() or "work from home" in t.lower() for t in [title, location, *extensions]
+    )
+    company = item.get("company_name") or item.get("company") or ""
+
+    return {
+        "remote": remote,
+        # The listing's own schedule type wins; the title is only a fallback
+        "employment_type": _normalize_employment_type(schedule) or _normalize_employment_type(title),
+        "schedule": schedule,
+        "company": company.strip().lower() or None,
+    }
+
+
+class ResultSet:
+    """Compact result set with one bitmap per (facet, value)."""
+
+    def __init__(self, jobs: List[Dict[str, Any]], query: Optional[str] = None, location: Optional[str] = None,
+                 queries: Optional[List[str]] = None):
+        self.jobs = list(jobs)
+        self.query = query
+        # Every query the jobs were fetched for (several after a fan-out)
+        self.queries = list(queries) if queries else [query]
+        self.location = location
+        self.created_at = time.time()
+        self.all_bits = (1 << len(self.jobs)) - 1
+        self._index: Dict[str, Dict[Any, int]] = {}
+        for i, job in enumerate(self.jobs):
+            for facet, value in (job.get("facets") or {}).items():
+                if value is None:
+                    continue
+                values = self._index.setdefault(facet, {})
+                values[value] = values.get(value, 0) | (1 << i)
+
+    def bits(self, facet: str, value: Any) -> int:
+        return self._index.get(facet, {}).get(value, 0)
+
+    def refine(
+        self,
+        remote: Optional[bool] = None,
+        employment_type: Optional[str] = None,
+        company: Optional[str] = None,
+        exclude_companies: Iterable[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """Jobs matching every given facet, in their original ranking order."""
+        mask = self.all_bits
+        if remote is not None:
+            mask &= self.bits("remote", bool(remote))
+        if employment_type:
+            mask &= self.bits("employment_type", employment_type)
+        if company:
+            mask &= self.bits("company", company.strip().lower())
+        for name in exclude_companies:
+            # substring match so "amazon" also drops "Amazon Web Services"
+            needle = name.strip().lower()
+            for value, bits in self._index.get("company", {}).items():
+                if needle and needle in value:
+                    mask &= ~bits
+
+        out: List[Dict[str, Any]] = []
+        while mask:
+            low = mask & -mask
+            out.append(self.jobs[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+
+class ResultSetStore:
+    """Bounded LRU of the latest ResultSet per session (survives warm invocations)."""
+
+    def __init__(self, max_sessions: int = 200, ttl: int = 1800):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sets: "OrderedDict[str, ResultSet]" = OrderedDict()
+
+    def put(self, session_id: str, result_set: ResultSet) -> None:
+        self._sets[session_id] = result_set
+        self._sets.move_to_end(session_id)
+        while len(self._sets) > self.max_sessions:
+            self._sets.popitem(last=False)
+
+    def get(self, session_id: str) -> Optional[ResultSet]:
+        result_set = self._sets.get(session_id)
+        if result_set is None:
+            return None
+        if time.time() - result_set.created_at > self.ttl:
+            del self._sets[session_id]
+            return None
+        self._sets.move_to_end(session_id)
+        return result_set
+
+
+def normalize_employment_type(value: Optional[str]) -> Optional[str]:
+    """Maps user/agent wording ("internships", "Full-time") onto facet values."""
+    if not value:
+        return None
+    return _normalize_employment_type(value.replace("_", "-")) or value.strip().lower()
@@ -1,17 +1,22 @@
 # tools/api_clients/serpapi_client.py
 import os
+import re
 import time
 import json
-import requests
 from typing import Dict, Any, Optional
+from job_summarizer import summarize_description
+from posted_date import parse_posted_at
+from result_facets import extract_facets
 
-# boto3 import is lazy (only used when we need to read secrets)
-try:
-    import boto3
-    from botocore.exceptions import ClientError
-except Exception:
-    boto3 = None
-    ClientError = Exception
+# boto3 is only needed to read secrets; aws_clients imports it on first use
+from aws_clients import get_client
+from lazy_imports import lazy_import
+
+# requests (+ urllib3, idna, charset_normalizer) loads with the first client,
+# so cache hits, prefetch pickups and duplicate invocations skip it
+requests = lazy_import("requests")
+
+_URL_RE = re.compile(r"https?://[^\s'\"<>]+")
 
 class SerpApiClient:
     # simple in-process cache so we don't hit Secrets Manager on every request
@@ -64,10 +69,12 @@ class SerpApiClient:
         if SerpApiClient._is_cache_valid():
             return SerpApiClient._cached_key  # type: ignore
 
-        if boto3 is None:
-            raise RuntimeError("boto3 is required to read secrets from AWS Secrets Manager but it is not available.")
+        try:
+            client = get_client("secretsmanager", region_name or self.region_name)
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("boto3 is required to read secrets from AWS Secrets Manager but it is not available.") from e
 
-        client = boto3.client("secretsmanager", region_name=region_name or self.region_name)
         try:
             resp = client.get_secret_value(SecretId=secret_name)
         except ClientError as e:
@@ -95,7 +102,6 @@ class SerpApiClient:
         return key
 
     def search_google_jobs(self, query: str, location: Optional[str] = None, limit: int = 10, next_page_token: Optional[str] = None) -> Dict[str, Any]:
-        import re, json
         # normalize inputs
         q = (query or "").strip()
         loc = (location or "").strip() if location is not None else None
@@ -131,7 +137,7 @@ class SerpApiClient:
             raise RuntimeError(f"SerpApi returned an error: {detail}")
 
         # url regex + recursive finder
-        url_re = re.compile(r"https?://[^\s'\"<>]+")
+        url_re = _URL_RE
         def find_first_url_in_obj(obj):
             if obj is None: return None
             if isinstance(obj, str):
@@ -157,6 +163,9 @@ class SerpApiClient:
 
         # safe extractor for posted_at inside extensions (handles dict or list)
         def extract_posted_at_from_extensions(item):
+            detected = item.get("detected_extensions")
+            if isinstance(detected, dict) and detected.get("posted_at"):
+                return detected.get("posted_at")
             ext = item.get("extensions")
             if not ext:
                 return None
@@ -197,11 +206,9 @@ class SerpApiClient:
             if not link:
                 link = find_first_url_in_obj(item)
 
-            # prefer 'description' then 'snippet'
+            # prefer 'description' then 'snippet'; keep the requirements/pay/location sentences
             raw_snippet = item.get("description") or item.get("snippet") or item.get("raw_description") or ""
-            snippet = (raw_snippet or "").strip()
-            if len(snippet) > 800:
-                snippet = snippet[:800].rsplit(" ", 1)[0] + "…"
+            snippet = summarize_description(raw_snippet, budget=800)
 
             posted_at = item.get("posted_at") or extract_posted_at_from_extensions(item) or (item.get("extensions") if isinstance(item.get("extensions"), str) else None)
 
@@ -212,11 +219,14 @@ class SerpApiClient:
                 "snippet": snippet,
                 "location": item.get("location"),
                 "posted_at": posted_at,
+                "posted_ts": parse_posted_at(posted_at, now=fetched_at),
                 "job_id": item.get("job_id"),
                 "source": item.get("via") or item.get("source") or item.get("site") or item.get("provider"),
+                "facets": extract_facets(item),
                 "raw_preview": None if link else raw_preview_of_item(item, max_chars=500)
             }
 
+        fetched_at = time.time()
         jobs = []
         primary_list = data.get("jobs_results") or data.get("jobs") or data.get("organic_results") or []
         for item in primary_list[:num]:
@@ -0,0 +1,274 @@
+# tools/cold_start_profiler.py
+"""
+Cold-start import profiler for the backend Lambdas.
+
+Imports each handler module (found through the Handler in backend/*/template.yml)
+in a fresh interpreter under `python -X importtime`, once with lazy imports on
+and once with LAZY_IMPORTS=0, and reports per handler:
+  - INIT wall time and RSS growth (median over --repeat runs)
+  - self import time and allocated memory per top-level package
+  - packages the lazy-import layer keeps out of INIT, and the time/memory saved
+  - imports triggered by a cheap first request (e.g. the frontend's OPTIONS preflight)
+
+Probes run with PRIMING=0. Deployed, a handler's priming steps run during INIT
+and import some lazy packages anyway (PRIMED_IMPORTS); the report notes which
+savings that gives back.
+
+--json writes the results with sorted keys (commit it and `git diff` later runs);
+--compare prints how the current run differs from such a file.
+
+Usage:
+  python tools/cold_start_profiler.py
+  python tools/cold_start_profiler.py --handler serpapi-google-jobs --repeat 5 --json cold_start.json
+  python tools/cold_start_profiler.py --compare cold_start.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import sysconfig
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND = os.path.join(ROOT, "backend")
+
+# A request each handler can serve without AWS or network calls
+PROBE_EVENTS = {
+    "career-matching-frontend-handler": {"requestContext": {"http": {"method": "OPTIONS"}}, "headers": {}},
+}
+
+# Priming step -> lazy package it imports during a deployed INIT (priming.py)
+PRIMED_IMPORTS = {
+    "serpapi-google-jobs": {"serpapi.com": "requests"},
+    "resume-analyzer-lambda": {"PyPDF2": "PyPDF2"},
+}
+
+PROBE = r'''
+import json, resource, sys, time
+module_name, handler_name, event_json, trace_memory = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4] == "1"
+if trace_memory:
+    import tracemalloc
+    tracemalloc.start()
+result = {"error": None}
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+sys.stderr.write("#probe:init\n"); sys.stderr.flush()
+started = time.perf_counter()
+try:
+    module = __import__(module_name)
+except BaseException as e:
+    module = None
+    result["error"] = f"{type(e).__name__}: {e}"
+result["init_ms"] = (time.perf_counter() - started) * 1000
+result["rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+if trace_memory:
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    result["allocations"] = [[s.traceback[0].filename, s.size] for s in snapshot.statistics("filename")]
+if module is not None and event_json:
+    sys.stderr.write("#probe:event\n"); sys.stderr.flush()
+    started = time.perf_counter()
+    try:
+        getattr(module, handler_name)(json.loads(event_json), None)
+    except BaseException as e:
+        result["event_error"] = f"{type(e).__name__}: {e}"
+    result["event_ms"] = (time.perf_counter() - started) * 1000
+sys.stdout.write("\n#probe:result " + json.dumps(result) + "\n")
+'''
+
+_HANDLER_RE = re.compile(r"^\s*Handler:\s*([\w.]+)\s*$", re.MULTILINE)
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def discover_handlers() -> Dict[str, dict]:
+    """{lambda dir name: {"src", "module", "function"}} for every backend/*/template.yml."""
+    handlers = {}
+    for name in sorted(os.listdir(BACKEND)):
+        template = os.path.join(BACKEND, name, "template.yml")
+        if not os.path.isfile(template):
+            continue
+        with open(template, encoding="utf-8") as f:
+            match = _HANDLER_RE.search(f.read())
+        if match:
+            module, function = match.group(1).rsplit(".", 1)
+            handlers[name] = {"src": os.path.join(BACKEND, name, "src"), "module": module, "function": function}
+    return handlers
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, float]]:
+    """Self import time (ms) per top-level package, split into "init" and "event" phases."""
+    phases: Dict[str, Dict[str, float]] = {"init": defaultdict(float), "event": defaultdict(float)}
+    phase = None
+    for line in stderr.splitlines():
+        if line == "#probe:init":
+            phase = "init"
+        elif line == "#probe:event":
+            phase = "event"
+        elif phase:
+            match = _IMPORTTIME_RE.match(line)
+            if match:
+                phases[phase][match.group(4).split(".")[0]] += int(match.group(1)) / 1000
+    return {phase: dict(packages) for phase, packages in phases.items()}
+
+
+# Most specific first: site-packages lives inside the stdlib directory
+_LIBRARY_DIRS = [sysconfig.get_paths()[key] for key in ("purelib", "platlib", "stdlib", "platstdlib")]
+
+
+def package_of(filename: str, src: str) -> str:
+    """Top-level package a source file belongs to, named the way -X importtime names it."""
+    path = os.path.abspath(filename)
+    for base in [src] + _LIBRARY_DIRS:
+        if path.startswith(base + os.sep):
+            parts = os.path.relpath(path, base).split(os.sep)
+            first = parts[1] if parts[0] == "lib-dynload" and len(parts) > 1 else parts[0]
+            return first.split(".")[0]
+    return "<other>"
+
+
+def run_probe(handler: dict, lazy: bool, event: Optional[dict], trace_memory: bool = False) -> dict:
+    # Priming (priming.py) is network work, not import cost; keep it out of the measurement
+    env = dict(os.environ, LAZY_IMPORTS="1" if lazy else "0", PRIMING="0", PYTHONUNBUFFERED="1")
+    env.setdefault("AWS_REGION", "us-east-1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, handler["module"], handler["function"],
+         json.dumps(event) if event else "", "1" if trace_memory else "0"],
+        cwd=handler["src"], env=env, capture_output=True, text=True, timeout=120,
+    )
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("#probe:result ")]
+    if not lines:
+        return {"error": f"probe exited with {proc.returncode}: {proc.stderr.strip().splitlines()[-1:]}",
+                "init_ms": 0.0, "rss_kb": 0}
+    result = json.loads(lines[-1][len("#probe:result "):])
+    result["imports_ms"] = parse_importtime(proc.stderr)
+    return result
+
+
+def profile_mode(handler: dict, lazy: bool, event: Optional[dict], repeat: int) -> dict:
+    runs = [run_probe(handler, lazy, event) for _ in range(repeat)]
+    traced = run_probe(handler, lazy, None, trace_memory=True)
+
+    def median(key, phase="init"):
+        if key == "imports_ms":
+            names = {name for r in runs for name in r.get(key, {}).get(phase, {})}
+            return {name: round(statistics.median(r.get(key, {}).get(phase, {}).get(name, 0.0) for r in runs), 2) for name in names}
+        values = [r[key] for r in runs if key in r]
+        return round(statistics.median(values), 2) if values else None
+
+    memory_kb: Dict[str, float] = defaultdict(float)
+    for filename, size in traced.get("allocations", []):
+        memory_kb[package_of(filename, handler["src"])] += size / 1024
+    memory_kb.pop("<other>", None)  # the probe itself
+
+    result = {
+        "init_ms": median("init_ms"),
+        "rss_kb": median("rss_kb"),
+        "init_imports_ms": median("imports_ms", "init"),
+        "init_alloc_kb": {name: round(kb, 1) for name, kb in memory_kb.items() if kb >= 1},
+        "error": runs[0].get("error"),
+    }
+    if event and result["error"] is None:
+        result["event_ms"] = median("event_ms")
+        result["event_imports_ms"] = median("imports_ms", "event")
+        result["event_error"] = runs[0].get("event_error")
+    return result
+
+
+def profile_handler(name: str, handler: dict, repeat: int) -> dict:
+    event = PROBE_EVENTS.get(name)
+    lazy = profile_mode(handler, True, event, repeat)
+    eager = profile_mode(handler, False, event, repeat)
+    savings = None
+    # A failed import stops early, so its timings can't be compared
+    if lazy["error"] is None and eager["error"] is None:
+        savings = {
+            "init_ms": round(eager["init_ms"] - lazy["init_ms"], 2),
+            "rss_kb": eager["rss_kb"] - lazy["rss_kb"],
+            "deferred_imports_ms": {pkg: ms for pkg, ms in eager["init_imports_ms"].items()
+                                    if pkg not in lazy["init_imports_ms"]},
+        }
+    return {"entry_point": f"{handler['module']}.{handler['function']}", "lazy": lazy, "eager": eager,
+            "savings": savings}
+
+
+def _top(packages: Dict[str, float], n: int) -> List[tuple]:
+    return sorted(packages.items(), key=lambda item: -item[1])[:n]
+
+
+def print_report(results: Dict[str, dict], top: int) -> None:
+    for name, r in results.items():
+        lazy, eager, savings = r["lazy"], r["eager"], r["savings"]
+        print(f"\n=== {name} ({r['entry_point']}) ===")
+        for label, mode in (("lazy ", lazy), ("eager", eager)):
+            error = f"  [import failed: {mode['error']}]" if mode["error"] else ""
+            print(f"  INIT {label}  {mode['init_ms']:8.1f} ms  {mode['rss_kb'] / 1024:6.1f} MB RSS{error}")
+        if savings is None:
+            print("  saved       n/a (an import failed; install the handler's dependencies to compare)")
+        else:
+            print(f"  saved       {savings['init_ms']:8.1f} ms  {savings['rss_kb'] / 1024:6.1f} MB")
+        if savings and savings["deferred_imports_ms"]:
+            deferred = ", ".join(f"{pkg} ({ms:.1f} ms)" for pkg, ms in _top(savings["deferred_imports_ms"], top))
+            print(f"  kept out of INIT: {deferred}")
+        for step, pkg in PRIMED_IMPORTS.get(name, {}).items():
+            print(f"  note: measured with PRIMING=0; deployed, the '{step}' priming step imports {pkg} "
+                  f"(and what it imports) during INIT, so that part of the saving doesn't apply")
+        if "event_ms" in lazy:
+            loaded = ", ".join(f"{pkg} ({ms:.1f} ms)" for pkg, ms in _top(lazy["event_imports_ms"], top)) or "none"
+            print(f"  first request {lazy['event_ms']:.1f} ms; imports it triggered: {loaded}")
+        print(f"  {'top INIT imports (lazy)':<28}{'self ms':>9}{'alloc KB':>10}")
+        for pkg, ms in _top(lazy["init_imports_ms"], top):
+            print(f"    {pkg:<26}{ms:9.1f}{lazy['init_alloc_kb'].get(pkg, 0):10.1f}")
+
+
+def print_comparison(results: Dict[str, dict], baseline: Dict[str, dict], threshold_ms: float = 1.0) -> None:
+    print("\n=== Compared with baseline (lazy INIT) ===")
+    for name, r in results.items():
+        before = baseline.get(name, {}).get("lazy")
+        if not before:
+            print(f"  {name}: not in baseline")
+            continue
+        after = r["lazy"]
+        print(f"  {name}: {before['init_ms']:.1f} -> {after['init_ms']:.1f} ms "
+              f"({after['init_ms'] - before['init_ms']:+.1f}), "
+              f"RSS {(after['rss_kb'] - before['rss_kb']) / 1024:+.1f} MB")
+        packages = set(before["init_imports_ms"]) | set(after["init_imports_ms"])
+        for pkg in sorted(packages):
+            delta = after["init_imports_ms"].get(pkg, 0.0) - before["init_imports_ms"].get(pkg, 0.0)
+            if abs(delta) >= threshold_ms:
+                print(f"    {pkg:<26}{delta:+9.1f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--handler", action="append", help="Lambda directory name (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode; medians are reported")
+    parser.add_argument("--top", type=int, default=8, help="packages listed per handler")
+    parser.add_argument("--json", help="write results to this file (sorted keys, diffable)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --json run")
+    args = parser.parse_args(argv)
+
+    handlers = discover_handlers()
+    names = args.handler or list(handlers)
+    unknown = [n for n in names if n not in handlers]
+    if unknown:
+        parser.error(f"unknown handler(s) {unknown}; choose from {list(handlers)}")
+
+    results = {name: profile_handler(name, handlers[name], max(args.repeat, 1)) for name in names}
+    print_report(results, args.top)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(results, json.load(f)["handlers"])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "handlers": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nWrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
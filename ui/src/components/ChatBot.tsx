@@ -26,6 +26,10 @@ const ChatBot: React.FC = () => {
   const [isUploading, setIsUploading] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
+  // One backend agent session per browser tab conversation
+  const sessionIdRef = useRef<string>(
+    `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`
+  );
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -53,7 +57,7 @@ const ChatBot: React.FC = () => {
         {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ message: content }),
+          body: JSON.stringify({ message: content, sessionId: sessionIdRef.current }),
         }
       );
 